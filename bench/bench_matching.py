@@ -0,0 +1,167 @@
+"""저장된 캡쳐 이미지의 템플릿 매칭 비용 측정 (RPA 실행 시 얼마나 느리고 헷갈리는지)
+
+~/Pictures/SophiaCapture/<이미지이름>/ 폴더마다 원본 스크린샷(<이미지이름>.png 등)을 --sources 폴더에서 찾아,
+폴더 안의 캡쳐 이미지 각각을 모든 매칭 방식 x 검색 영역으로 찾아보고 느린 순/유일하지 않은 순으로 출력한다.
+
+    python bench/bench_matching.py --sources C:/shots
+    python bench/bench_matching.py --library D:/captures --sources C:/shots -n 5 --json result.json
+    python bench/bench_matching.py --sources C:/shots --regions FULL,LEFT_TOP --methods CCOEFF_NORMED
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core import RegionName, get_region, lazy_import  # noqa: E402
+from dir_index import IMAGE_EXTENSIONS  # noqa: E402
+from matcher import MATCH_METHODS, TemplateMatcher  # noqa: E402
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+DEFAULT_LIBRARY = os.path.join(os.path.expanduser("~"), "Pictures", "SophiaCapture")
+REGION_NAMES = ["FULL"] + [region_name.name for region_name in RegionName]
+
+
+def read_image(path):
+    return cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)  # 한글 경로 지원
+
+
+def find_source(image_name, source_dirs):
+    """캡쳐 폴더 이름과 같은 이름의 원본 이미지 (없으면 None)"""
+    for folder in source_dirs:
+        for ext in IMAGE_EXTENSIONS:
+            for candidate in (image_name + ext, image_name + ext.upper()):
+                path = os.path.join(folder, candidate)
+                if os.path.isfile(path):
+                    return path
+    return None
+
+
+def collect(library, source_dirs):
+    """[(원본 경로, [캡쳐 경로, ...]), ...] 와 원본을 못 찾은 폴더 목록"""
+    jobs, missing = [], []
+    for entry in sorted(os.scandir(library), key=lambda e: e.name):
+        if not entry.is_dir():
+            continue
+        crops = sorted(os.path.join(entry.path, name) for name in os.listdir(entry.path)
+                       if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS)
+        if not crops:
+            continue
+        source = find_source(entry.name, source_dirs)
+        if source is None:
+            missing.append(entry.name)
+            continue
+        jobs.append((source, crops))
+    return jobs, missing
+
+
+def bench_crop(matcher, source_size, template, methods, regions, repeat):
+    """캡쳐 1장을 방식 x 영역 조합마다 repeat번 매칭 -> 결과 dict 목록"""
+    w_img, h_img = source_size
+    rows = []
+    for region_name in regions:
+        search_region = None if region_name == "FULL" else get_region(RegionName[region_name], (0, 0, w_img, h_img))
+        for method in methods:
+            times, result = [], None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = matcher.match(template, search_region, method)
+                times.append((time.perf_counter() - start) * 1000)
+            row = {"region": region_name, "method": method, "median_ms": statistics.median(times), "min_ms": min(times)}
+            if result is None:
+                row.update(found=False)
+            else:
+                row.update(found=True, x=result.x, y=result.y, score=result.score,
+                           second_score=result.second_score, uniqueness=result.uniqueness, levels=result.levels)
+            rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="캡쳐 라이브러리 템플릿 매칭 지연/유일성 측정")
+    parser.add_argument("--library", default=DEFAULT_LIBRARY, help="캡쳐 저장 폴더 (기본: ~/Pictures/SophiaCapture)")
+    parser.add_argument("--sources", action="append", default=[], help="원본 스크린샷 폴더 (여러 번 지정 가능)")
+    parser.add_argument("--methods", default=",".join(MATCH_METHODS), help="매칭 방식 (쉼표 구분)")
+    parser.add_argument("--regions", default=",".join(REGION_NAMES), help="검색 영역 (쉼표 구분, FULL = 전체)")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="조합별 반복 횟수")
+    parser.add_argument("--top", type=int, default=10, help="순위 목록 길이")
+    parser.add_argument("--threshold", type=float, default=0.9, help="이 점수 이상이면 찾은 것으로 봄 (유일성 순위 대상)")
+    parser.add_argument("--json", help="전체 결과를 저장할 JSON 파일 (회귀 비교용)")
+    args = parser.parse_args()
+
+    methods = [m.strip() for m in args.methods.split(",") if m.strip()]
+    regions = [r.strip() for r in args.regions.split(",") if r.strip()]
+    for method in methods:
+        if method not in MATCH_METHODS:
+            parser.error(f"알 수 없는 매칭 방식: {method} ({', '.join(MATCH_METHODS)})")
+    for region_name in regions:
+        if region_name not in REGION_NAMES:
+            parser.error(f"알 수 없는 검색 영역: {region_name}")
+    source_dirs = args.sources or [args.library]
+
+    jobs, missing = collect(args.library, source_dirs)
+    for name in missing:
+        print(f"skip: {name} - 원본 이미지를 찾을 수 없음 (--sources 확인)")
+    if not jobs:
+        print(f"{args.library}: 측정할 캡쳐가 없습니다.")
+        return 1
+
+    records = []
+    start = time.perf_counter()
+    for source_path, crops in jobs:
+        source = read_image(source_path)
+        if source is None:
+            print(f"skip: {source_path} - 이미지를 읽을 수 없음")
+            continue
+        matcher = TemplateMatcher(source)
+        matcher.match(source[:16, :16])  # 피라미드 생성을 측정에서 제외
+        h_img, w_img = source.shape[:2]
+        for crop_path in crops:
+            template = read_image(crop_path)
+            if template is None:
+                print(f"skip: {crop_path} - 이미지를 읽을 수 없음")
+                continue
+            for row in bench_crop(matcher, (w_img, h_img), template, methods, regions, args.repeat):
+                row.update(source=source_path, crop=crop_path, w=template.shape[1], h=template.shape[0])
+                records.append(row)
+        print(f"{os.path.basename(source_path)}: {len(crops)} crops")
+    elapsed = time.perf_counter() - start
+
+    # 검색 영역 밖에 있는 캡쳐는 점수가 낮으므로 유일성 순위에서 제외
+    found = [r for r in records if r["found"] and r["score"] >= args.threshold]
+    print(f"\n{len(records)} matches ({len(records) - len(found)} below score {args.threshold}), {elapsed:.1f}s")
+    print(f"{'method':16} {'median ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    for method in methods:
+        times = sorted(r["median_ms"] for r in records if r["method"] == method)
+        if times:
+            p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+            print(f"{method:16} {statistics.median(times):10.1f} {p95:10.1f} {times[-1]:10.1f}")
+
+    def label(r):
+        return f"{os.path.relpath(r['crop'], args.library)} [{r['method']}, {r['region']}]"
+
+    print(f"\nslowest {args.top}:")
+    for r in sorted(records, key=lambda r: r["median_ms"], reverse=True)[:args.top]:
+        print(f"  {r['median_ms']:8.1f} ms  {r['w']}x{r['h']}  {label(r)}")
+
+    print(f"\nleast unique {args.top} (score - 2nd score):")
+    for r in sorted(found, key=lambda r: r["uniqueness"])[:args.top]:
+        second = f"{r['second_score']:.3f}" if r["second_score"] is not None else "-"
+        print(f"  {r['uniqueness']:6.3f}  score={r['score']:.3f} 2nd={second}  {label(r)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"library": args.library, "methods": methods, "regions": regions,
+                       "repeat": args.repeat, "elapsed_sec": elapsed, "results": records},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n{args.json} saved")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
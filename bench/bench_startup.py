@@ -0,0 +1,79 @@
+"""시작 시간(cold start) 측정
+
+각 경로를 새 파이썬 프로세스로 여러 번 실행해서 소요 시간(중앙값/최소)을 출력한다.
+
+    python bench/bench_startup.py            # 기본 5회
+    python bench/bench_startup.py -n 10 --importtime   # 느린 import 상위 목록도 출력
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+
+# (이름, 실행할 코드) - 모두 src를 sys.path에 넣고 실행
+CASES = [
+    ("python (baseline)", "pass"),
+    ("import core", "import core"),
+    ("import utils", "import utils"),
+    ("import batch_crop", "import batch_crop"),
+    ("main.py --help", "import runpy, sys; sys.argv = ['main.py', '--help']\ntry:\n    runpy.run_path(r'%s', run_name='__main__')\nexcept SystemExit:\n    pass" % os.path.join(ROOT, "main.py")),
+    ("import sophia (GUI module)", "import sophia"),
+    ("core + cv2/numpy used", "import core; cv2 = core.lazy_import('cv2'); cv2.IMREAD_COLOR"),
+]
+
+
+def run_once(code):
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}")
+    return elapsed
+
+
+def slowest_imports(code, top=10):
+    """python -X importtime 결과에서 누적 시간이 큰 모듈"""
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not name.startswith("  ") or "." in name:
+            continue  # 최상위(직접 import한) 모듈만
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sophia-capture 시작 시간 측정")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="경로별 실행 횟수")
+    parser.add_argument("--importtime", action="store_true", help="경로별 느린 import 상위 목록 출력")
+    args = parser.parse_args()
+
+    print(f"{'case':32} {'median ms':>10} {'min ms':>10}")
+    baseline = None
+    for name, code in CASES:
+        try:
+            times = [run_once(code) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{name:32} {'skip':>10}  ({e})")
+            continue
+        median = statistics.median(times) * 1000
+        if baseline is None:
+            baseline = median
+        print(f"{name:32} {median:10.1f} {min(times) * 1000:10.1f}   (+{median - baseline:.1f} over baseline)")
+        if args.importtime and code != "pass":
+            for cumulative_us, module in slowest_imports(code):
+                print(f"    {module:28} {cumulative_us / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,33 @@
+"""sophia-capture 배치 모드 (GUI 없이 manifest로 이미지 잘라내기)
+
+    python main.py regions.txt -o out_folder -j 8
+
+manifest 형식은 src/batch_crop.py 참고. PySide6를 import하지 않는다.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from batch_crop import run_batch  # noqa: E402
+
+
 def main():
-    print("Hello from sophia-capture!")
+    parser = argparse.ArgumentParser(description="manifest의 Region/Rectangle로 이미지를 잘라 저장")
+    parser.add_argument("manifest", help="이미지 경로 + Region 목록 파일")
+    parser.add_argument("-o", "--output", default=os.path.join(os.path.expanduser("~"), "Pictures", "SophiaCapture"),
+                        help="저장 폴더 (이미지별 하위 폴더 생성, 기본: ~/Pictures/SophiaCapture)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--ext", default=".png", help="저장 형식 (png, .jpg ..., 기본: .png)")
+    args = parser.parse_args()
+
+    try:
+        errors = run_batch(args.manifest, args.output, workers=args.workers, ext=args.ext)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    sys.exit(1 if errors else 0)
 
 
 if __name__ == "__main__":
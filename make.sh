@@ -16,7 +16,9 @@ echo "🚀 PyInstaller 실행..."
 PLUGINS_PATH=$(python -c "import PySide6; import os; print(os.path.join(os.path.dirname(PySide6.__file__), 'plugins'))")
 echo "PLUGINS_PATH: $PLUGINS_PATH"
 
-pyinstaller --noconsole --onefile --icon="$ICON_PATH" --add-data "${PLUGINS_PATH}/platforms;platforms" src/sophia.py
+# cv2/numpy는 lazy_import로 불러오므로 PyInstaller가 찾을 수 있게 hidden-import로 지정
+pyinstaller --noconsole --onefile --icon="$ICON_PATH" --add-data "${PLUGINS_PATH}/platforms;platforms" \
+    --hidden-import cv2 --hidden-import numpy src/sophia.py
 
 # 실행 파일 이름 설정
 TARGET_NAME="sophia"
@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('C:\\Users\\PC\\work\\sophia-capture\\.venv\\Lib\\site-packages\\PySide6\\plugins/platforms', 'platforms')],
-    hiddenimports=[],
+    hiddenimports=['cv2', 'numpy'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
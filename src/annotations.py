@@ -0,0 +1,141 @@
+from core import lazy_import
+np = lazy_import("numpy")
+
+GRID_CELL = 64  # 공간 인덱스 격자 크기 (원본 이미지 픽셀)
+
+
+class AnnotationStore:
+    """마크(점)와 region(사각형)을 원본 이미지 좌표로 보관한다.
+
+    - 마크 좌표는 numpy 배열에 연속으로 저장 (수만 개도 가볍게)
+    - 격자(GRID_CELL) 단위 공간 인덱스로 클릭 위치 검색과 화면 밖 마크 제외를 빠르게 처리
+    """
+
+    def __init__(self):
+        # 배열은 처음 사용할 때 만든다 (프로그램 시작 시 numpy import를 피함)
+        self._xs = None
+        self._ys = None
+        self.mark_count = 0
+        self._grid = {}  # (cell_x, cell_y) -> set(마크 인덱스)
+        self._regions = None  # (N, 4) = (x, y, w, h)
+        self._queued = None  # 내보내기를 기다리는 잘라낼 영역 (N, 4)
+
+    # ---- 마크 ----
+    def add_mark(self, x, y):
+        """마크 추가 후 인덱스 반환"""
+        if self._xs is None:
+            self._xs = np.empty(256, dtype=np.int32)
+            self._ys = np.empty(256, dtype=np.int32)
+        elif self.mark_count == len(self._xs):
+            self._xs = np.resize(self._xs, len(self._xs) * 2)
+            self._ys = np.resize(self._ys, len(self._ys) * 2)
+        index = self.mark_count
+        self._xs[index] = x
+        self._ys[index] = y
+        self.mark_count += 1
+        self._grid.setdefault((x // GRID_CELL, y // GRID_CELL), set()).add(index)
+        return index
+
+    def remove_mark(self, index):
+        """마크 삭제 (마지막 마크를 빈 자리로 옮김)"""
+        last = self.mark_count - 1
+        x, y = int(self._xs[index]), int(self._ys[index])
+        self._grid[(x // GRID_CELL, y // GRID_CELL)].discard(index)
+        if index != last:
+            lx, ly = int(self._xs[last]), int(self._ys[last])
+            cell = self._grid[(lx // GRID_CELL, ly // GRID_CELL)]
+            cell.discard(last)
+            cell.add(index)
+            self._xs[index] = lx
+            self._ys[index] = ly
+        self.mark_count = last
+
+    def mark(self, index):
+        return int(self._xs[index]), int(self._ys[index])
+
+    def marks(self):
+        """(xs, ys) view"""
+        if self._xs is None:
+            empty = np.empty(0, dtype=np.int32)
+            return empty, empty
+        return self._xs[:self.mark_count], self._ys[:self.mark_count]
+
+    def clear_marks(self):
+        self.mark_count = 0
+        self._grid.clear()
+
+    def find_mark(self, x, y, radius):
+        """(x, y)에서 radius 이내의 가장 가까운 마크 인덱스 (없으면 None)"""
+        best, best_dist = None, radius * radius
+        for cy in range((y - radius) // GRID_CELL, (y + radius) // GRID_CELL + 1):
+            for cx in range((x - radius) // GRID_CELL, (x + radius) // GRID_CELL + 1):
+                for index in self._grid.get((cx, cy), ()):
+                    dist = (int(self._xs[index]) - x) ** 2 + (int(self._ys[index]) - y) ** 2
+                    if dist <= best_dist:
+                        best, best_dist = index, dist
+        return best
+
+    def marks_in_rect(self, x0, y0, x1, y1):
+        """사각형 [x0, x1) x [y0, y1) 안의 마크 좌표 (xs, ys)"""
+        xs, ys = self.marks()
+        cells_x = x1 // GRID_CELL - x0 // GRID_CELL + 1
+        cells_y = y1 // GRID_CELL - y0 // GRID_CELL + 1
+        if cells_x * cells_y < len(self._grid):
+            # 확대해서 일부만 보일 때: 겹치는 격자만 조회
+            indices = [index
+                       for cy in range(y0 // GRID_CELL, y1 // GRID_CELL + 1)
+                       for cx in range(x0 // GRID_CELL, x1 // GRID_CELL + 1)
+                       for index in self._grid.get((cx, cy), ())]
+            if not indices:
+                return xs[:0], ys[:0]
+            indices = np.fromiter(indices, dtype=np.intp, count=len(indices))
+            xs, ys = xs[indices], ys[indices]
+        mask = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        return xs[mask], ys[mask]
+
+    # ---- region ----
+    @property
+    def regions(self):
+        if self._regions is None:
+            self._regions = np.empty((0, 4), dtype=np.int32)
+        return self._regions
+
+    def add_region(self, x, y, w, h):
+        self._regions = np.vstack([self.regions, np.array([[x, y, w, h]], dtype=np.int32)])
+
+    def clear_regions(self):
+        self._regions = None
+
+    def regions_in_rect(self, x0, y0, x1, y1):
+        """사각형과 겹치는 region들 (N, 4)"""
+        return _overlapping(self.regions, x0, y0, x1, y1)
+
+    # ---- 내보내기 대기 영역 (여러 장을 모았다가 한 번에 저장) ----
+    @property
+    def queued_regions(self):
+        if self._queued is None:
+            self._queued = np.empty((0, 4), dtype=np.int32)
+        return self._queued
+
+    def queue_region(self, x, y, w, h):
+        self._queued = np.vstack([self.queued_regions, np.array([[x, y, w, h]], dtype=np.int32)])
+
+    def unqueue_last(self):
+        """마지막으로 넣은 영역을 빼서 반환 (없으면 None)"""
+        if not len(self.queued_regions):
+            return None
+        last = tuple(self._queued[-1].tolist())
+        self._queued = self._queued[:-1]
+        return last
+
+    def clear_queued(self):
+        self._queued = None
+
+    def queued_in_rect(self, x0, y0, x1, y1):
+        return _overlapping(self.queued_regions, x0, y0, x1, y1)
+
+
+def _overlapping(r, x0, y0, x1, y1):
+    """(N, 4) 사각형 중 [x0, x1) x [y0, y1)과 겹치는 것"""
+    mask = (r[:, 0] < x1) & (r[:, 0] + r[:, 2] > x0) & (r[:, 1] < y1) & (r[:, 1] + r[:, 3] > y0)
+    return r[mask]
@@ -0,0 +1,175 @@
+"""manifest(이미지 경로 + Region/Rectangle 목록)로 여러 이미지를 한꺼번에 잘라 저장 (GUI 없이)
+
+manifest 형식 (kavana 스크립트/info 영역 출력과 같은 모양):
+
+    # 주석
+    [C:/shots/batang.png]
+    ok_button = Region(10, 20, 30, 40)
+    Rectangle(100, 200, 150, 260)
+
+- [경로] 줄 아래의 region들이 그 이미지에 적용된다 (상대 경로는 manifest 위치 기준)
+- 결과는 {출력 폴더}/{이미지이름}/{이름}{확장자}, 다른 폴더의 같은 이름 이미지는 {이미지이름}_2, _3 ... 폴더로
+- 같은 이미지가 여러 번 나오면 region을 합친다 (디코딩 한 번)
+- "이름 = " 을 생략하면 {이미지이름}_{순번} 으로 저장, 같은 이미지에서 이름이 겹치면 오류
+"""
+import os
+import re
+import time
+from core import lazy_import, extract_x_y_w_h
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+_NAME_PATTERN = re.compile(r"^\s*([A-Za-z_][\w]*)\s*=\s*(.+)$")
+
+
+def normalize_ext(ext):
+    """저장 확장자를 ".png" 모양으로 ("png", "PNG", ".png" 모두 허용)"""
+    ext = ext.strip().lower()
+    if not ext.lstrip("."):
+        raise ValueError(f"잘못된 저장 형식: {ext!r}")
+    return "." + ext.lstrip(".")
+
+
+def _unique_folder(stem, used):
+    """stem, stem_2, stem_3 ... 중 아직 쓰지 않은 폴더 이름 (대소문자 구분 없이 비교)"""
+    folder, n = stem, 1
+    while folder.lower() in used:
+        n += 1
+        folder = f"{stem}_{n}"
+    used.add(folder.lower())
+    return folder
+
+
+def parse_manifest(manifest_path):
+    """manifest 파싱 -> [(이미지 경로, 저장 하위 폴더 이름, [(이름, (x, y, w, h)), ...]), ...]
+
+    저장 경로가 겹치지 않도록 폴더 이름과 region 이름을 여기서 정한다.
+    명시한 이름이 같은 이미지 안에서 겹치면 ValueError.
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = {}  # 정규화한 이미지 경로 -> (이미지 경로, 폴더 이름, regions)
+    names = {}  # 정규화한 이미지 경로 -> {소문자 이름: 처음 나온 줄 번호}
+    used_folders = set()
+    current = None
+    pending_auto = []  # 이름을 생략한 region (이미지 경로 키, regions 안 위치), 명시한 이름을 다 본 뒤에 번호를 붙임
+    with open(manifest_path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("[") and line.endswith("]"):
+                image_path = os.path.join(base_dir, line[1:-1].strip())
+                current = os.path.normcase(os.path.abspath(image_path))
+                if current not in jobs:
+                    stem = os.path.splitext(os.path.basename(image_path))[0]
+                    jobs[current] = (image_path, _unique_folder(stem, used_folders), [])
+                    names[current] = {}
+                continue
+            if current is None:
+                raise ValueError(f"{manifest_path}:{line_no}: 이미지 경로 [..] 보다 region이 먼저 나왔습니다.")
+
+            match = _NAME_PATTERN.match(line)
+            name, text = (match.group(1), match.group(2)) if match else (None, line)
+            try:
+                region = extract_x_y_w_h(text)
+            except ValueError as e:
+                raise ValueError(f"{manifest_path}:{line_no}: {e}") from None
+            regions = jobs[current][2]
+            if name is None:
+                pending_auto.append((current, len(regions)))
+            else:
+                first = names[current].setdefault(name.lower(), line_no)
+                if first != line_no:
+                    raise ValueError(f"{manifest_path}:{line_no}: 이름 {name}이 {first}번째 줄과 겹칩니다 (같은 파일로 저장됨).")
+            regions.append((name, region))
+
+    # 이름 생략: {이미지이름}_{순번}, 명시한 이름과 겹치는 번호는 건너뜀
+    for key, i in pending_auto:
+        image_path, _, regions = jobs[key]
+        stem = os.path.splitext(os.path.basename(image_path))[0]
+        n = i
+        while f"{stem}_{n}".lower() in names[key]:
+            n += 1
+        name = f"{stem}_{n}"
+        names[key][name.lower()] = 0
+        regions[i] = (name, regions[i][1])
+    return list(jobs.values())
+
+
+def crop_source(image_path, folder_name, regions, output_dir, ext=".png"):
+    """이미지 1장을 한 번만 디코딩하고 모든 region을 잘라 저장 (프로세스 풀 작업 단위)
+
+    Returns:
+        dict: 처리 결과 (crops, bytes, decode_sec, encode_sec, errors)
+    """
+    result = {"image": image_path, "crops": 0, "bytes": 0, "decode_sec": 0.0, "encode_sec": 0.0, "errors": []}
+
+    start = time.perf_counter()
+    try:
+        image = cv2.imdecode(np.fromfile(image_path, dtype=np.uint8), cv2.IMREAD_COLOR)
+    except OSError as e:
+        result["errors"].append(f"{image_path}: 파일을 읽을 수 없습니다. ({e.strerror or e})")
+        return result
+    result["decode_sec"] = time.perf_counter() - start
+    if image is None:
+        result["errors"].append(f"{image_path}: 이미지를 읽을 수 없습니다.")
+        return result
+
+    save_folder = os.path.join(output_dir, folder_name)
+    try:
+        os.makedirs(save_folder, exist_ok=True)
+    except OSError as e:
+        result["errors"].append(f"{save_folder}: 폴더를 만들 수 없습니다. ({e.strerror or e})")
+        return result
+
+    h_img, w_img = image.shape[:2]
+    start = time.perf_counter()
+    for name, (x, y, w, h) in regions:
+        if w <= 0 or h <= 0 or x < 0 or y < 0 or x + w > w_img or y + h > h_img:
+            result["errors"].append(f"{image_path}: {name} Region({x}, {y}, {w}, {h}) 이미지 범위를 벗어남")
+            continue
+        ret, buffer = cv2.imencode(ext, image[y:y + h, x:x + w])  # 잘라낸 부분은 view, 복사 없음
+        if not ret:
+            result["errors"].append(f"{image_path}: {name} 인코딩 실패")
+            continue
+        try:
+            buffer.tofile(os.path.join(save_folder, f"{name}{ext}"))  # 한글 경로 지원
+        except OSError as e:
+            result["errors"].append(f"{image_path}: {name} 저장 실패 ({e.strerror or e})")
+            continue
+        result["crops"] += 1
+        result["bytes"] += buffer.nbytes
+    result["encode_sec"] = time.perf_counter() - start
+    return result
+
+
+def run_batch(manifest_path, output_dir, workers=None, ext=".png"):
+    """manifest 전체를 프로세스 풀로 처리하고 통계를 출력, 오류 건수 반환"""
+    from concurrent.futures import ProcessPoolExecutor  # multiprocessing import는 실제 실행 시에만
+    ext = normalize_ext(ext)
+    jobs = parse_manifest(manifest_path)
+    total_regions = sum(len(regions) for _, _, regions in jobs)
+    print(f"{len(jobs)} images, {total_regions} regions -> {output_dir}")
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(crop_source, image_path, folder_name, regions, output_dir, ext)
+                   for image_path, folder_name, regions in jobs]
+        for future in futures:
+            result = future.result()
+            results.append(result)
+            for error in result["errors"]:
+                print(f"Error: {error}")
+    elapsed = time.perf_counter() - start
+
+    crops = sum(r["crops"] for r in results)
+    nbytes = sum(r["bytes"] for r in results)
+    decode_sec = sum(r["decode_sec"] for r in results)
+    encode_sec = sum(r["encode_sec"] for r in results)
+    errors = sum(len(r["errors"]) for r in results)
+    print(f"crops: {crops}/{total_regions}, errors: {errors}, written: {nbytes / 1024 / 1024:.1f} MB")
+    print(f"elapsed: {elapsed:.2f}s, {len(jobs) / elapsed if elapsed else 0:.1f} images/s, "
+          f"{crops / elapsed if elapsed else 0:.1f} crops/s, {nbytes / 1024 / 1024 / elapsed if elapsed else 0:.1f} MB/s")
+    print(f"worker time: decode {decode_sec:.2f}s, crop+encode+write {encode_sec:.2f}s")
+    return errors
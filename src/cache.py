@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """바이트 예산으로 크기를 제한하는 LRU 캐시 (스레드 안전)
+
+    항목을 넣을 때 크기(bytes)를 함께 받고, 합계가 max_bytes를 넘으면
+    가장 오래 사용하지 않은 항목부터 버린다.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._items = OrderedDict()  # key -> (value, nbytes)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return default
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key, value, nbytes):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._items[key] = (value, nbytes)
+            self.total_bytes += nbytes
+            self._evict()
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._items.pop(key, None)
+            if item is None:
+                return default
+            self.total_bytes -= item[1]
+            return item[0]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+    def set_max_bytes(self, max_bytes):
+        """예산 변경 (줄어들면 즉시 정리)"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self):
+        # 방금 넣은 항목 하나는 예산보다 커도 남겨 둔다
+        while self.total_bytes > self.max_bytes and len(self._items) > 1:
+            _, (_, nbytes) = self._items.popitem(last=False)
+            self.total_bytes -= nbytes
@@ -0,0 +1,159 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from core import TEMP_SUFFIX, lazy_import, next_save_path
+from timing import span
+cv2 = lazy_import("cv2")
+
+DEFAULT_WRITER_THREADS = 2
+DEFAULT_MAX_PENDING = 32  # 대기 큐 최대 길이 (가득 차면 submit이 기다림)
+DEFAULT_BATCH_THREADS = os.cpu_count() or 4  # export_batch 인코딩 스레드 수 (cv2.imencode는 GIL을 놓음)
+
+
+class CaptureWriter:
+    """잘라낸 이미지를 백그라운드 스레드에서 인코딩 후 파일로 저장한다.
+
+    - submit()은 이미지(view)와 저장 경로만 큐에 넣고 바로 돌아온다
+    - 큐가 가득 차면 submit()이 빈 자리가 날 때까지 기다린다 (backpressure)
+    - 완료/실패 callback은 워커 스레드에서 호출되므로 UI 갱신은 Signal로 넘겨야 한다
+    - 다른 프로세스가 같은 이름에 먼저 저장했으면 다음 번호로 저장하고, 완료 callback에는 실제 경로를 넘긴다
+    - export_batch()는 여러 장을 코어 수만큼의 스레드로 한꺼번에 인코딩한다
+    """
+
+    def __init__(self, workers=DEFAULT_WRITER_THREADS, max_pending=DEFAULT_MAX_PENDING, batch_workers=DEFAULT_BATCH_THREADS):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._batch_executor = ThreadPoolExecutor(max_workers=batch_workers, thread_name_prefix="capture-batch")
+        self.batch_workers = batch_workers
+        self._batch_futures = set()
+        self._batch_lock = threading.RLock()  # 이미 끝난 future의 done callback은 submit한 스레드에서 바로 불림
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._run, name=f"capture-writer-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, image, save_path, on_done=None, on_error=None):
+        """image를 save_path에 저장하도록 큐에 넣는다 (확장자로 인코딩 형식 결정)"""
+        self._queue.put((image, save_path, on_done, on_error))
+
+    def export_batch(self, jobs, on_finished):
+        """jobs [(image, save_path), ...]를 한꺼번에 병렬로 저장 (큐를 거치지 않으므로 바로 돌아옴)
+
+        모두 끝나면 마지막 작업의 스레드에서 on_finished(results) 호출,
+        results는 jobs 순서대로 (실제 저장 경로, 오류 메세지 또는 None, 저장한 바이트 수)
+        """
+        if not jobs:
+            on_finished([])
+            return
+        results = [None] * len(jobs)
+        remaining = [len(jobs)]
+        lock = threading.Lock()
+
+        def run(i, image, save_path):
+            try:
+                saved_path, nbytes = self._encode_write(image, save_path)
+                results[i] = (saved_path, None, nbytes)
+            except Exception as e:
+                results[i] = (save_path, str(e), 0)
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                on_finished(results)
+
+        with self._batch_lock:
+            for i, (image, save_path) in enumerate(jobs):
+                future = self._batch_executor.submit(run, i, image, save_path)
+                self._batch_futures.add(future)
+                future.add_done_callback(self._batch_done)
+
+    def _batch_done(self, future):
+        with self._batch_lock:
+            self._batch_futures.discard(future)
+
+    def pending_count(self):
+        return self._queue.unfinished_tasks + len(self._batch_futures)
+
+    def flush(self):
+        """큐와 export_batch 작업이 모두 끝날 때까지 대기"""
+        self._queue.join()
+        with self._batch_lock:
+            futures = list(self._batch_futures)
+        wait(futures)
+
+    def shutdown(self):
+        """남은 작업을 모두 저장한 뒤 워커 종료"""
+        self.flush()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._batch_executor.shutdown(wait=True)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+            image, save_path, on_done, on_error = job
+            try:
+                save_path, _ = self._encode_write(image, save_path)
+            except Exception as e:
+                if on_error:
+                    on_error(save_path, str(e))
+            else:
+                if on_done:
+                    on_done(save_path)
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _encode_write(image, save_path):
+        """확장자 형식으로 인코딩해서 저장, (실제 저장 경로, 저장한 바이트 수) 반환
+
+        임시 이름을 배타적으로 만들어 다 쓴 뒤 save_path에 하드 링크로 붙이므로,
+        다른 프로그램(감시 폴더, 썸네일)이 쓰다 만 파일을 보지 않고 다른 프로세스의 파일을 덮어쓰지 않는다.
+        어느 쪽이든 이미 있으면 다음 번호로 다시 시도한다.
+        """
+        ext = save_path[save_path.rfind("."):]
+        with span("encode", image.nbytes, format=ext):
+            ret, buffer = cv2.imencode(ext, image)
+        if not ret:
+            raise ValueError("이미지 인코딩 실패")
+        with span("write", buffer.nbytes, path=save_path):
+            while True:
+                temp_path = save_path + TEMP_SUFFIX
+                try:
+                    fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0))
+                except FileExistsError:
+                    save_path = next_save_path(save_path)  # 다른 프로세스가 같은 이름을 쓰는 중
+                    continue
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        buffer.tofile(f)
+                    if _publish(temp_path, save_path):
+                        return save_path, buffer.nbytes
+                finally:
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                save_path = next_save_path(save_path)
+
+
+def _publish(temp_path, save_path):
+    """temp_path를 save_path 이름으로 (이미 있으면 덮어쓰지 않고 False)"""
+    try:
+        os.link(temp_path, save_path)
+        return True
+    except FileExistsError:
+        return False
+    except OSError:
+        pass  # 하드 링크를 지원하지 않는 파일 시스템
+    if os.path.exists(save_path):
+        return False
+    os.replace(temp_path, save_path)
+    return True
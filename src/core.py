@@ -0,0 +1,223 @@
+"""Qt/OpenCV 없이 쓸 수 있는 region 계산, 저장 경로 할당, 문자열 파싱
+
+GUI(sophia.py)와 배치 CLI(main.py)가 함께 사용한다. 무거운 모듈(cv2, numpy)은
+lazy_import로 처음 사용할 때 import해서 시작 시간을 줄인다.
+"""
+import importlib
+from enum import Enum
+import os
+import re
+import threading
+from typing import Optional, Tuple
+
+
+class _LazyModule:
+    """처음 속성에 접근할 때 실제 모듈을 import하는 대리 객체"""
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+
+    def __getattr__(self, attr):
+        # 한 번 import한 뒤에는 모듈 속성을 복사해 두어 이후 접근은 일반 속성 조회
+        module = importlib.import_module(self.__dict__["_name"])
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """import를 첫 사용 시점까지 미룬 모듈 (예: cv2 = lazy_import("cv2"))
+
+    PyInstaller가 찾지 못하므로 빌드 시 --hidden-import 로 추가할 것.
+    """
+    return _LazyModule(name)
+
+
+np = lazy_import("numpy")
+
+
+class RegionName(Enum):
+    LEFT_ONE_THIRD = 1
+    RIGHT_ONE_THIRD = 2
+    TOP_ONE_THIRD = 3
+    BOTTOM_ONE_THIRD = 4
+    LEFT_TOP = 5
+    RIGHT_TOP = 6
+    RIGHT_BOTTOM = 7
+    LEFT_BOTTOM = 8
+    CENTER = 9
+    LEFT = 10
+    RIGHT = 11
+    TOP = 12
+    BOTTOM = 13
+
+def get_region(region_name: RegionName, base_region: Optional[Tuple[int, int, int, int]] = None) -> Tuple[int, int, int, int]:
+
+    left, top, width, height = base_region
+
+    if region_name == RegionName.LEFT_ONE_THIRD:
+        return (left, top, width // 3, height)
+    elif region_name == RegionName.RIGHT_ONE_THIRD:
+        return (left + 2 * (width // 3), top, width // 3, height)
+    elif region_name == RegionName.TOP_ONE_THIRD:
+        return (left, top, width, height // 3)
+    elif region_name == RegionName.BOTTOM_ONE_THIRD:
+        return (left, top + 2 * (height // 3), width, height // 3)
+    elif region_name == RegionName.LEFT_TOP:
+        return (left, top, width // 2, height // 2)
+    elif region_name == RegionName.RIGHT_TOP:
+        return (left + width // 2, top, width // 2, height // 2)
+    elif region_name == RegionName.RIGHT_BOTTOM:
+        return (left + width // 2, top + height // 2, width // 2, height // 2)
+    elif region_name == RegionName.LEFT_BOTTOM:
+        return (left, top + height // 2, width // 2, height // 2)
+    elif region_name == RegionName.CENTER:
+        return (left + width // 3, top + height // 3, width // 3, height // 3)
+    elif region_name == RegionName.LEFT:
+        return (left, top, width // 2, height)
+    elif region_name == RegionName.RIGHT:
+        return (left + width // 2, top, width // 2, height)
+    elif region_name == RegionName.TOP:
+        return (left, top, width, height // 2)
+    elif region_name == RegionName.BOTTOM:
+        return (left, top + height // 2, width, height // 2)
+    else:
+        raise ValueError("잘못된 RegionName 값입니다.")
+    
+def get_regions(base_regions):
+    """여러 base region에 대해 모든 RegionName 영역을 한 번에 계산 (get_region의 벡터화 버전)
+
+    Args:
+        base_regions: (N, 4) 배열 또는 (x, y, w, h) 튜플 목록
+
+    Returns:
+        numpy.ndarray: (N, 13, 4) int64 배열, [i, region_name.value - 1] = get_region(region_name, base_regions[i])
+    """
+    base = np.asarray(base_regions, dtype=np.int64).reshape(-1, 4)
+    left, top, width, height = base.T
+    # get_region과 같은 정수 나눗셈(floor)
+    w2, w3, h2, h3 = width // 2, width // 3, height // 2, height // 3
+
+    regions = {
+        RegionName.LEFT_ONE_THIRD: (left, top, w3, height),
+        RegionName.RIGHT_ONE_THIRD: (left + 2 * w3, top, w3, height),
+        RegionName.TOP_ONE_THIRD: (left, top, width, h3),
+        RegionName.BOTTOM_ONE_THIRD: (left, top + 2 * h3, width, h3),
+        RegionName.LEFT_TOP: (left, top, w2, h2),
+        RegionName.RIGHT_TOP: (left + w2, top, w2, h2),
+        RegionName.RIGHT_BOTTOM: (left + w2, top + h2, w2, h2),
+        RegionName.LEFT_BOTTOM: (left, top + h2, w2, h2),
+        RegionName.CENTER: (left + w3, top + h3, w3, h3),
+        RegionName.LEFT: (left, top, w2, height),
+        RegionName.RIGHT: (left + w2, top, w2, height),
+        RegionName.TOP: (left, top, width, h2),
+        RegionName.BOTTOM: (left, top + h2, width, h2),
+    }
+    out = np.empty((len(base), len(RegionName), 4), dtype=np.int64)
+    for region_name, columns in regions.items():
+        out[:, region_name.value - 1] = np.stack(columns, axis=-1)
+    return out
+
+
+TEMP_SUFFIX = ".tmp"  # 저장 중인 파일의 이름 (save_path + TEMP_SUFFIX), 다 쓰면 save_path로 바꿈
+_SAVE_NAME_PATTERN = re.compile(r"^(.+)_(\d+)\.([^.]+)$")
+
+
+class SavePathAllocator:
+    """폴더 하나에 대한 "{base_name}_{번호}.{ext}" 저장 경로 할당기
+
+    처음 한 번만 폴더를 훑어 다음 번호를 구하고, 이후에는 메모리의 번호를 증가시킨다.
+    예약은 메모리에서만 하므로 (디스크에 빈 파일을 만들지 않음) 여러 저장 스레드가
+    동시에 할당받아도 이름이 겹치지 않고, 저장 전에 종료돼도 빈 파일이 남지 않는다.
+    다른 프로세스와의 충돌은 CaptureWriter가 배타적 생성으로 확인하고 next_save_path로 다음 번호를 받는다.
+    """
+
+    def __init__(self, folder_path, base_name="image", ext=".png"):
+        self.folder_path = folder_path
+        self.base_name = base_name
+        self.ext = ext
+        self._lock = threading.Lock()
+        self._next = self._scan_next_index()
+
+    def _filename(self, count):
+        return f"{self.base_name}_{count}.{self.ext}"
+
+    def _scan_next_index(self):
+        """폴더에 있는 "{base_name}_{번호}.{ext}" 중 가장 큰 번호 + 1 (파일은 건드리지 않음)"""
+        pattern = re.compile(rf"^{re.escape(self.base_name)}_(\d+)\.{re.escape(self.ext)}$", re.IGNORECASE)
+        try:
+            names = os.listdir(self.folder_path)
+        except OSError:
+            return 0
+        numbers = [int(m.group(1)) for m in map(pattern.match, names) if m]
+        return max(numbers) + 1 if numbers else 0
+
+    def allocate(self):
+        """새 저장 경로를 (메모리에서) 예약하고 반환"""
+        with self._lock:
+            while True:
+                save_path = os.path.join(self.folder_path, self._filename(self._next))
+                self._next += 1
+                # 다른 프로그램이 만들었거나 쓰는 중(임시 파일)이면 다음 번호로
+                if not os.path.exists(save_path) and not os.path.exists(save_path + TEMP_SUFFIX):
+                    return save_path
+
+
+_allocators = {}
+_allocators_lock = threading.Lock()
+
+
+def get_save_path(folder_path, base_name="image", ext=".png"):
+    """중복되지 않는 저장 경로를 반환한다. (파일은 만들지 않고 메모리에서 예약)
+    
+    Args:
+        folder_path (str): 저장할 폴더 경로
+        base_name (str): 파일 이름 기본값 (예: "image")
+        ext (str): 확장자 (예: ".png")
+
+    Returns:
+        str: 저장할 파일 전체 경로
+    """
+    key = (os.path.normcase(os.path.abspath(folder_path)), base_name, ext)
+    with _allocators_lock:
+        allocator = _allocators.get(key)
+        if allocator is None:
+            allocator = SavePathAllocator(folder_path, base_name, ext)
+            _allocators[key] = allocator
+    return allocator.allocate()
+
+
+def next_save_path(save_path):
+    """save_path("{base_name}_{번호}.{ext}")를 다른 프로그램이 먼저 가져갔을 때 같은 폴더의 다음 경로
+
+    번호가 붙은 이름이 아니면 FileExistsError.
+    """
+    folder_path, name = os.path.split(save_path)
+    m = _SAVE_NAME_PATTERN.match(name)
+    if not m:
+        raise FileExistsError(f"이미 있는 파일: {save_path}")
+    return get_save_path(folder_path, base_name=m.group(1), ext=m.group(3))
+
+
+def extract_x_y_w_h(text: str) -> tuple[int, int, int, int]:
+    """
+    문자열에서 (x, y, w, h) 형태의 Region 정보를 추출하여 반환
+    - Region(1,2,3,4) → (1,2,3,4)
+    - Rectangle(1,2,3,4) → (x, y, w=x2-x, h=y2-y)
+    - 1,2,3,4 → (1,2,3,4)
+    """
+    numbers = re.findall(r"\d+", text)
+    if len(numbers) != 4:
+        raise ValueError("숫자 4개가 포함된 문자열이 아닙니다.")
+
+    x1, y1, x2, y2 = map(int, numbers)
+
+    if "rectangle" in text.lower():
+        x = x1
+        y = y1
+        w = x2 - x1
+        h = y2 - y1
+        if w <= 0 or h <= 0:
+            raise ValueError("Rectangle 좌표가 올바르지 않습니다.")
+        return (x, y, w, h)
+
+    return (x1, y1, x2, y2)
@@ -0,0 +1,137 @@
+import bisect
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+def _is_image(name):
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+class DirectoryIndex:
+    """폴더의 이미지 파일을 수정시각 순으로 정렬해 둔 인덱스 (next/prev 탐색 순서)
+
+    - position(path)는 dict 조회라 O(1)
+    - refresh()는 폴더를 한 번 훑어서 새로 생긴 파일은 넣고, 없어진 파일은 빼고,
+      덮어써서 수정시각이 바뀐 파일은 새 위치로 옮긴다
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.files = []  # 정렬된 전체 경로 목록 (refresh 시 새 리스트로 교체)
+        self._entries = []  # 정렬된 (mtime, name)
+        self._mtimes = {}  # name -> mtime
+        self._positions = {}  # normcase(name) -> files 인덱스
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self.last_added = []  # 마지막 refresh()에서 새로 생긴 파일 경로 (처음 구성 때는 비어 있음)
+
+    def refresh(self):
+        """폴더 내용과 인덱스를 맞춘다 (처음 호출 시 전체 구성)"""
+        try:
+            with os.scandir(self.folder) as it:
+                current = {entry.name: entry for entry in it if _is_image(entry.name) and entry.is_file()}
+        except OSError as e:
+            print(f"Error: 폴더 인덱스 실패 {self.folder}: {e}")
+            current = {}
+
+        # 현재 수정시각 (Windows는 scandir 결과에 들어 있어 추가 비용 없음), 그 사이 지워진 파일은 제외
+        current_mtimes = {}
+        for name, entry in current.items():
+            try:
+                current_mtimes[name] = entry.stat().st_mtime
+            except OSError:
+                continue
+
+        with self._lock:
+            entries = self._entries
+            mtimes = dict(self._mtimes)
+            changed = False
+
+            # 없어진 파일, 덮어써서 수정시각이 바뀐 파일은 빼고 (바뀐 파일은 아래에서 새 위치로 다시 넣음)
+            stale = {name for name, mtime in mtimes.items() if current_mtimes.get(name) != mtime}
+            if stale:
+                entries = [e for e in entries if e[1] not in stale]
+                for name in stale:
+                    del mtimes[name]
+                changed = True
+
+            # 새로 생긴 파일과 바뀐 파일을 정렬 위치에 삽입
+            added = [name for name in current_mtimes if name not in mtimes]
+            inserted = []
+            if added:
+                entries = list(entries)
+                for name in added:
+                    mtime = current_mtimes[name]
+                    is_new = name not in self._mtimes
+                    mtimes[name] = mtime
+                    bisect.insort(entries, (mtime, name))
+                    if is_new:
+                        inserted.append(os.path.join(self.folder, name))
+                changed = True
+            self.last_added = inserted if self._ready.is_set() else []
+
+            if changed or not self._ready.is_set():
+                self._entries = entries
+                self._mtimes = mtimes
+                self.files = [os.path.join(self.folder, name) for _, name in entries]
+                self._positions = {os.path.normcase(name): i for i, (_, name) in enumerate(entries)}
+        self._ready.set()
+        return changed
+
+    def wait_ready(self, timeout=None):
+        """처음 구성이 끝날 때까지 대기"""
+        return self._ready.wait(timeout)
+
+    def position(self, file_path):
+        """file_path의 탐색 순서상 위치 (없으면 None)"""
+        return self._positions.get(os.path.normcase(os.path.basename(file_path)))
+
+    def neighbor(self, file_path, offset):
+        """file_path에서 offset만큼 떨어진 파일 (순환), 인덱스에 없으면 None"""
+        files, positions = self.files, self._positions
+        index = positions.get(os.path.normcase(os.path.basename(file_path)))
+        if index is None or not files:
+            return None
+        return files[(index + offset) % len(files)]
+
+
+class FolderIndexes:
+    """폴더별 DirectoryIndex 모음, 구성/갱신은 백그라운드 스레드 하나에서 순서대로 처리"""
+
+    def __init__(self):
+        self._indexes = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dir-index")
+
+    def index(self, folder):
+        """folder의 인덱스 (처음이면 백그라운드에서 구성 시작)"""
+        key = os.path.normcase(os.path.abspath(folder))
+        index = self._indexes.get(key)
+        if index is None:
+            index = DirectoryIndex(folder)
+            self._indexes[key] = index
+            self._executor.submit(index.refresh)
+        return index
+
+    def refresh(self, folder, callback=None):
+        """백그라운드에서 인덱스 갱신, 끝나면 워커 스레드에서 callback(index, changed) 호출"""
+        index = self.index(folder)
+
+        def run():
+            changed = index.refresh()
+            if callback:
+                callback(index, changed)
+        self._executor.submit(run)
+
+    def run_after_ready(self, folder, fn):
+        """인덱스 구성이 끝난 뒤 워커 스레드에서 fn(index) 실행 (작업은 순서대로 처리됨)"""
+        index = self.index(folder)
+        self._executor.submit(fn, index)
+
+    def folders(self):
+        return [index.folder for index in self._indexes.values()]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
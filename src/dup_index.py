@@ -0,0 +1,163 @@
+"""잘라낸 이미지의 지각 해시(dHash)와 라이브러리 전체 해시 인덱스 (거의 같은 캡처 찾기)
+
+dHash: 흑백 9x8로 줄인 뒤 가로로 이웃한 픽셀의 밝기 비교 64비트.
+크기/압축/약간의 색 차이에는 거의 그대로이고, 다른 버튼이면 여러 비트가 달라진다.
+
+인덱스는 multi-index hashing: 64비트를 16비트 4조각으로 나눠 조각별 dict에 넣는다.
+해밍 거리가 r 이하인 두 해시는 적어도 한 조각의 거리가 r // 4 이하이므로,
+조각마다 그 범위의 값만 dict에서 찾고 후보만 전체 거리를 계산한다 (10만 개에서도 조회 1ms 미만).
+
+파일은 ~/Pictures/SophiaCapture/capture_hashes.txt 에 "해시(16진수)\\t경로" 한 줄씩 덧붙여 쓴다.
+"""
+import os
+import threading
+from itertools import combinations
+from concurrent.futures import ThreadPoolExecutor
+from core import lazy_import
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+HASH_FILE_NAME = "capture_hashes.txt"
+DEFAULT_DUPLICATE_DISTANCE = 6  # 해밍 거리가 이 이하면 거의 같은 이미지로 봄 (64비트 중)
+CHUNKS = 4
+CHUNK_BITS = 64 // CHUNKS
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+
+def dhash(image):
+    """BGR(또는 흑백) 이미지의 64비트 dHash"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def _chunks(value):
+    return [(value >> (i * CHUNK_BITS)) & CHUNK_MASK for i in range(CHUNKS)]
+
+
+_flip_masks = {}
+
+
+def _flip_masks_for(radius):
+    """조각에서 radius 비트 이하를 뒤집는 XOR 마스크 목록 (0 포함)"""
+    masks = _flip_masks.get(radius)
+    if masks is None:
+        masks = [sum(1 << p for p in positions)
+                 for r in range(radius + 1) for positions in combinations(range(CHUNK_BITS), r)]
+        _flip_masks[radius] = masks
+    return masks
+
+
+class HashIndex:
+    """해시 -> 경로 목록, 해밍 거리 검색 (UI 스레드에서 조회/추가, 파일 읽기만 백그라운드)"""
+
+    def __init__(self, path, max_distance=DEFAULT_DUPLICATE_DISTANCE):
+        self.path = path
+        self.max_distance = max_distance
+        self._hashes = []  # 해시 (추가 순서)
+        self._paths = []  # 같은 순서의 경로 (지워진 항목은 None)
+        self._pending = {}  # add() 했지만 아직 저장이 끝나지 않은 경로 -> 항목 번호
+        self._tables = [{} for _ in range(CHUNKS)]  # 조각 값 -> [항목 번호]
+        self._lock = threading.Lock()
+        self._file = None
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def _insert(self, value, path):
+        index = len(self._hashes)
+        self._hashes.append(value)
+        self._paths.append(path)
+        for table, chunk in zip(self._tables, _chunks(value)):
+            table.setdefault(chunk, []).append(index)
+
+    def load(self):
+        """파일에서 읽어 인덱스 구성 (워커 스레드), 읽은 항목 수 반환"""
+        entries = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    value, _, path = line.rstrip("\n").partition("\t")
+                    try:
+                        entries.append((int(value, 16), path))
+                    except ValueError:
+                        continue  # 쓰는 도중 종료된 줄
+        except OSError:
+            return 0
+        with self._lock:
+            for value, path in entries:
+                self._insert(value, path)
+        return len(entries)
+
+    def add(self, value, path):
+        """인덱스에 추가, 저장이 끝나면 saved()로 파일에 기록 (그 전에는 파일이 없어도 있는 것으로 봄)"""
+        with self._lock:
+            self._pending[path] = len(self._hashes)
+            self._insert(value, path)
+
+    def find(self, value, max_distance=None):
+        """value와 가장 가까운 (거리, 경로), max_distance 안에 없으면 None (파일이 지워진 항목은 건너뜀)"""
+        radius = self.max_distance if max_distance is None else max_distance
+        masks = _flip_masks_for(radius // CHUNKS)
+        with self._lock:
+            hashes, paths = self._hashes, self._paths
+            candidates = set()
+            for table, chunk in zip(self._tables, _chunks(value)):
+                for mask in masks:
+                    bucket = table.get(chunk ^ mask)
+                    if bucket:
+                        candidates.update(bucket)
+            matches = [(distance, index) for index in candidates
+                       if (distance := (hashes[index] ^ value).bit_count()) <= radius and paths[index]]
+            matches.sort()
+            for distance, index in matches:
+                if paths[index] in self._pending or os.path.exists(paths[index]):
+                    return distance, paths[index]
+                paths[index] = None  # 사용자가 지웠거나 저장에 실패한 캡처
+        return None
+
+    def saved(self, path, saved_path=None):
+        """add()한 path 저장이 끝남 (다른 이름으로 저장됐으면 saved_path), 인덱스 파일에 기록"""
+        with self._lock:
+            index = self._pending.pop(path, None)
+            if index is None:
+                return  # 중복이라 add()하지 않은 캡처
+            if saved_path is not None:
+                self._paths[index] = saved_path
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(f"{self._hashes[index]:016x}\t{self._paths[index]}\n")
+                self._file.flush()
+            except OSError as e:
+                print(f"warning: 해시 인덱스 기록 실패 {self.path}: {e}")
+
+    def discard(self, path):
+        """add()한 path 저장 실패 (파일이 없으므로 이후 find에서 빠짐)"""
+        with self._lock:
+            self._pending.pop(path, None)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class HashIndexLoader:
+    """인덱스 파일 읽기를 백그라운드에서"""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hash-index")
+
+    def load(self, index, callback=None):
+        def run():
+            count = index.load()
+            if callback:
+                callback(count)
+        self._executor.submit(run)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,71 @@
+from core import lazy_import
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+SNAP_RADIUS = 8  # 이 거리(화면 픽셀) 안의 경계로 붙음
+CANNY_LOW = 50
+CANNY_HIGH = 150
+MIN_COVERAGE = 0.5  # 변 길이 중 이 비율 이상이 경계 픽셀이어야 "강한 경계"
+MIN_EDGE_PIXELS = 3
+
+
+class EdgeMap:
+    """Canny 경계를 열/행 방향으로 누적해 둔 표 (이미지를 열 때 백그라운드에서 한 번 만든다)
+
+    - 열 x의 [y0, y1) 구간 경계 픽셀 수 = cols[y1, x] - cols[y0, x]  (O(1))
+    - 행 y의 [x0, x1) 구간 경계 픽셀 수 = rows[y, x1] - rows[y, x0]  (O(1))
+    메모리: 픽셀당 4바이트 (uint16 누적표 2개)
+    """
+
+    def __init__(self, image):
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        edges = cv2.Canny(gray, CANNY_LOW, CANNY_HIGH) > 0
+        h, w = edges.shape
+        dtype = np.uint16 if max(h, w) < 65536 else np.uint32
+        self.width, self.height = w, h
+        self._cols = np.zeros((h + 1, w), dtype=dtype)
+        np.cumsum(edges, axis=0, dtype=dtype, out=self._cols[1:])
+        self._rows = np.zeros((h, w + 1), dtype=dtype)
+        np.cumsum(edges, axis=1, dtype=dtype, out=self._rows[:, 1:])
+
+    @property
+    def nbytes(self):
+        return self._cols.nbytes + self._rows.nbytes
+
+    def snap_x(self, x, y0, y1, radius):
+        """x에서 radius 이내에서 [y0, y1] 구간을 따라 강한 세로 경계가 있는 가장 가까운 열 (없으면 x)"""
+        y0, y1 = max(0, y0), min(self.height, y1 + 1)
+        lo, hi = max(0, x - radius), min(self.width - 1, x + radius)
+        if y1 <= y0 or hi < lo:
+            return x
+        counts = self._cols[y1, lo:hi + 1].astype(np.int32) - self._cols[y0, lo:hi + 1]
+        return _nearest_strong(counts, lo, x, y1 - y0)
+
+    def snap_y(self, y, x0, x1, radius):
+        """y에서 radius 이내에서 [x0, x1] 구간을 따라 강한 가로 경계가 있는 가장 가까운 행 (없으면 y)"""
+        x0, x1 = max(0, x0), min(self.width, x1 + 1)
+        lo, hi = max(0, y - radius), min(self.height - 1, y + radius)
+        if x1 <= x0 or hi < lo:
+            return y
+        counts = self._rows[lo:hi + 1, x1].astype(np.int32) - self._rows[lo:hi + 1, x0]
+        return _nearest_strong(counts, lo, y, x1 - x0)
+
+    def snap_rect(self, x0, y0, x1, y1, radius):
+        """사각형 [x0, x1] x [y0, y1] (양 끝 포함)의 네 변을 각각 가까운 경계로, 조회 4번"""
+        sx0 = self.snap_x(x0, y0, y1, radius)
+        sx1 = self.snap_x(x1, y0, y1, radius)
+        sy0 = self.snap_y(y0, x0, x1, radius)
+        sy1 = self.snap_y(y1, x0, x1, radius)
+        if sx1 < sx0 or sy1 < sy0:
+            return x0, y0, x1, y1
+        return sx0, sy0, sx1, sy1
+
+
+def _nearest_strong(counts, lo, pos, length):
+    """counts[i] (위치 lo + i의 경계 픽셀 수) 중 충분히 강한 것 가운데 pos에 가장 가까운 위치"""
+    strong = counts >= max(MIN_EDGE_PIXELS, int(length * MIN_COVERAGE))
+    if not strong.any():
+        return pos
+    distance = np.abs(np.arange(lo, lo + len(counts)) - pos)
+    distance[~strong] = len(counts) + 1
+    return lo + int(distance.argmin())
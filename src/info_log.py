@@ -0,0 +1,166 @@
+from enum import Enum
+from itertools import chain
+from typing import NamedTuple
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer, Signal
+from PySide6.QtGui import QColor, QKeySequence
+from PySide6.QtWidgets import QListView, QAbstractItemView, QApplication
+
+
+class InfoKind(Enum):
+    TEXT = "{}"
+    POINT = "Point({}, {})"
+    POINT_REMOVED = "Point({}, {}) removed"
+    REGION = "Region({}, {}, {}, {})"
+    RECTANGLE = "Rectangle({}, {}, {}, {})"
+    SAVED = "{} saved"
+    ERROR = "{}"
+
+
+class InfoEntry(NamedTuple):
+    """info 한 줄 (문자열은 표시할 때 만든다)"""
+    kind: InfoKind
+    values: tuple
+    prefix: str = ""
+
+    @property
+    def text(self):
+        return self.prefix + self.kind.value.format(*self.values)
+
+
+ERROR_COLOR = QColor("red")
+
+
+class InfoLogModel(QAbstractListModel):
+    """info 영역의 줄 목록
+
+    - add()는 대기 목록에 넣기만 하고, 이벤트 루프로 돌아갈 때 한 번에 행을 추가한다 (연속 추가 시 갱신 1회)
+    - 줄마다 종류(Point/Region/Rectangle/저장 경로)와 값을 그대로 보관한다
+    """
+    # 새 줄이 모델에 반영될 때 (한 번에 추가된 InfoEntry 목록, 작업 기록용)
+    entries_added = Signal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries = []
+        self._pending = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+
+    # ---- 추가 ----
+    def add(self, kind, *values, prefix=""):
+        self._pending.append(InfoEntry(kind, values, prefix))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(0)
+
+    def append(self, text):
+        """일반 텍스트 한 줄"""
+        self.add(InfoKind.TEXT, text)
+
+    def flush(self):
+        """대기 중인 줄을 모델에 반영 (뷰 갱신 1회)"""
+        self._flush_timer.stop()
+        if not self._pending:
+            return
+        first = len(self._entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(self._pending) - 1)
+        added = self._pending
+        self._entries.extend(added)
+        self._pending = []
+        self.endInsertRows()
+        self.entries_added.emit(added)
+
+    def prepend(self, entries):
+        """기록에서 복원한 줄을 맨 앞에 넣는다 (entries_added 없음)"""
+        if not entries:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(entries) - 1)
+        self._entries[:0] = entries
+        self.endInsertRows()
+
+    def clear(self):
+        self._flush_timer.stop()
+        self._pending = []
+        self.beginResetModel()
+        self._entries = []
+        self.endResetModel()
+
+    # ---- 조회 ----
+    def entries(self, kind=None):
+        """(대기 중인 것 포함) 모든 줄, kind를 주면 그 종류만"""
+        for entry in chain(self._entries, self._pending):
+            if kind is None or entry.kind is kind:
+                yield entry
+
+    def lines(self):
+        for entry in self.entries():
+            yield entry.text
+
+    def write_to(self, f):
+        """파일 객체에 한 줄씩 기록 (전체 문자열을 만들지 않음), 기록한 줄 수 반환"""
+        count = 0
+        for line in self.lines():
+            f.write(line)
+            f.write("\n")
+            count += 1
+        return count
+
+    def __len__(self):
+        return len(self._entries) + len(self._pending)
+
+    # ---- QAbstractListModel ----
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return entry.text
+        if role == Qt.ForegroundRole and entry.kind is InfoKind.ERROR:
+            return ERROR_COLOR
+        if role == Qt.UserRole:
+            return entry
+        return None
+
+    def flags(self, index):
+        # 사용자가 줄을 직접 고칠 수 있음 (고친 줄은 일반 텍스트가 됨)
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        self._entries[index.row()] = InfoEntry(InfoKind.TEXT, (value,))
+        self.dataChanged.emit(index, index)
+        return True
+
+
+class InfoLogView(QListView):
+    """InfoLogModel을 보여주는 뷰 (보이는 줄만 그림, 맨 아래를 보고 있으면 새 줄을 따라감)"""
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setUniformItemSizes(True)  # 줄 높이를 한 번만 계산 (수십만 줄도 스크롤 비용 일정)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self._follow = True
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        model.rowsInserted.connect(self._on_rows_inserted)
+
+    def _on_scrolled(self, value):
+        self._follow = value >= self.verticalScrollBar().maximum()
+
+    def _on_rows_inserted(self, *args):
+        if self._follow:
+            self.scrollToBottom()
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            # 선택한 줄 복사 (화면 순서대로)
+            rows = sorted(index.row() for index in self.selectedIndexes())
+            QApplication.clipboard().setText("\n".join(self.model().index(row).data() for row in rows))
+            return
+        super().keyPressEvent(event)
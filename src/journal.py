@@ -0,0 +1,148 @@
+"""이미지별 작업 기록 (마크, 사용자 region, info 줄)
+
+~/Pictures/SophiaCapture/{이미지이름}.{경로 해시}.journal.jsonl 에 한 줄에 하나씩 JSON으로 덧붙여 쓴다.
+파일을 다시 쓰지 않으므로 기록 비용은 작업 1건당 한 줄이다.
+이미지를 다시 열 때 처음부터 읽으며 재생해서 마지막 상태를 만든다.
+
+    {"op": "mark", "x": 10, "y": 20}
+    {"op": "mark_remove", "x": 10, "y": 20}
+    {"op": "marks_clear"}
+    {"op": "region", "x": 1, "y": 2, "w": 3, "h": 4}
+    {"op": "region_clear"}
+    {"op": "info", "kind": "REGION", "values": [1, 2, 3, 4], "prefix": "----->"}
+    {"op": "info_clear"}
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+
+def journal_path(image_path, root):
+    """image_path의 기록 파일 경로 (root/{이미지이름}.{경로 해시}.journal.jsonl)
+
+    이름이 같은 다른 폴더의 이미지나 확장자만 다른 이미지가 기록을 같이 쓰지 않도록
+    정규화한 절대 경로의 해시를 붙인다.
+    """
+    image_name, _ = os.path.splitext(os.path.basename(image_path))
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(image_path)).encode("utf-8")).hexdigest()[:10]
+    return os.path.join(root, f"{image_name}.{key}{JOURNAL_SUFFIX}")
+
+
+@dataclass
+class JournalState:
+    """기록을 재생한 결과"""
+    marks: dict = field(default_factory=dict)  # (x, y) -> 개수 (추가 순서 유지)
+    region: Optional[Tuple[int, int, int, int]] = None
+    info: list = field(default_factory=list)  # [(kind 이름, values, prefix), ...]
+    records: int = 0
+
+    def apply(self, record):
+        op = record.get("op")
+        if op == "mark":
+            key = (record["x"], record["y"])
+            self.marks[key] = self.marks.get(key, 0) + 1
+        elif op == "mark_remove":
+            key = (record["x"], record["y"])
+            count = self.marks.get(key, 0)
+            if count > 1:
+                self.marks[key] = count - 1
+            elif count:
+                del self.marks[key]
+        elif op == "marks_clear":
+            self.marks.clear()
+        elif op == "region":
+            self.region = (record["x"], record["y"], record["w"], record["h"])
+        elif op == "region_clear":
+            self.region = None
+        elif op == "info":
+            self.info.append((record["kind"], tuple(record["values"]), record.get("prefix", "")))
+        elif op == "info_clear":
+            self.info.clear()
+        self.records += 1
+
+    def mark_list(self):
+        """[(x, y), ...] (같은 위치에 여러 번 찍은 마크 포함)"""
+        return [key for key, count in self.marks.items() for _ in range(count)]
+
+
+def replay(path, limit=None):
+    """기록 파일을 처음부터 limit 바이트까지 재생 (없으면 빈 상태), 마지막 줄이 깨져 있으면 무시"""
+    state = JournalState()
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return state
+    position = 0
+    with f:
+        for line in f:  # 한 줄씩 읽음 (파일 전체를 메모리에 올리지 않음)
+            position += len(line)
+            if limit is not None and position > limit:
+                break
+            if not line.strip():
+                continue
+            try:
+                state.apply(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                continue  # 쓰는 도중 종료된 줄
+    return state
+
+
+class ImageJournal:
+    """이미지 1장의 기록 파일 (append-only), 처음 기록할 때 파일을 연다"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def write(self, records):
+        """records(dict 목록)를 한 줄씩 덧붙임"""
+        if not records:
+            return
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with self._lock:
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(lines)
+                self._file.flush()  # 프로그램이 비정상 종료되어도 남도록
+            except OSError as e:
+                print(f"warning: 작업 기록 실패 {self.path}: {e}")
+
+    def append(self, op, **fields):
+        self.write([dict(op=op, **fields)])
+
+    def size(self):
+        """현재 파일 크기 (재생할 범위)"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class JournalLoader:
+    """기록 재생을 백그라운드 스레드에서 (큰 기록도 UI를 막지 않음)"""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal")
+
+    def load(self, journal, callback):
+        """journal의 현재 내용까지 재생해서 워커 스레드에서 callback(state) 호출"""
+        limit = journal.size()  # 이후에 덧붙는 기록은 이미 화면에 반영된 것
+        self._executor.submit(lambda: callback(replay(journal.path, limit)))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
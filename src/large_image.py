@@ -0,0 +1,130 @@
+import glob
+import hashlib
+import os
+import threading
+from core import lazy_import
+from preview import app_cache_dir
+from timing import span
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+LARGE_IMAGE_PIXELS = 64 * 1024 * 1024  # 이보다 픽셀이 많으면 대용량 모드 (예: 20000x3400 이상)
+DEFAULT_MAPPED_CACHE_BYTES = 8 * 1024 * 1024 * 1024  # 디스크 캐시 예산 (넘으면 오래된 이미지부터 삭제)
+STRIP_ROWS = 1024  # 파일에 쓰거나 축소할 때 한 번에 처리할 행 수 (짝수)
+MIN_LEVEL_SIDE = 2048  # 미리 만들어 둘 피라미드 레벨의 긴 변 하한
+
+
+def is_large_image(size):
+    """(width, height)가 대용량 모드 대상인지"""
+    return size is not None and size[0] * size[1] >= LARGE_IMAGE_PIXELS
+
+
+def _level_size(size, k):
+    """k번째 피라미드 레벨 크기 (ZoomCache.level과 같은 방식으로 절반씩)"""
+    w, h = size
+    for _ in range(k):
+        w, h = max(1, w // 2), max(1, h // 2)
+    return w, h
+
+
+class MappedImageStore:
+    """디코딩한 픽셀(과 피라미드 레벨)을 로컬 디스크 파일에 두고 np.memmap으로 연다.
+
+    - 배열 전체가 메모리에 올라오지 않고 실제로 읽은 행의 페이지만 올라온다 (OS가 필요 없으면 내보냄)
+    - 키는 (경로, 파일 크기, 수정시각)이라 한 번 만들면 다음에 열 때는 디코딩하지 않는다
+    - 파일은 {해시}_{w}x{h}.L{k}.raw (BGR, 행 우선)
+    """
+
+    def __init__(self, folder=None, max_bytes=DEFAULT_MAPPED_CACHE_BYTES):
+        self.folder = folder or app_cache_dir("mapped")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _prefix(self, file_path, size):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        key = f"{os.path.normcase(os.path.abspath(file_path))}|{stat.st_size}|{stat.st_mtime_ns}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.folder, f"{digest}_{size[0]}x{size[1]}")
+
+    @staticmethod
+    def _map(path, size):
+        w, h = size
+        return np.memmap(path, dtype=np.uint8, mode="r", shape=(h, w, 3))
+
+    def open(self, file_path, size):
+        """이미 만들어 둔 원본 레벨 memmap (없으면 None)"""
+        prefix = self._prefix(file_path, size)
+        if prefix is None or not os.path.exists(prefix + ".L0.raw"):
+            return None
+        path = prefix + ".L0.raw"
+        os.utime(path)  # 최근 사용 표시 (캐시 정리 순서)
+        return self._map(path, size)
+
+    def create(self, file_path, image):
+        """디코딩된 image를 파일로 옮기고 memmap 반환 (워커 스레드), 피라미드 레벨도 함께 만든다"""
+        size = (image.shape[1], image.shape[0])
+        prefix = self._prefix(file_path, size)
+        if prefix is None:
+            return None
+        with self._lock:
+            os.makedirs(self.folder, exist_ok=True)
+            self._trim(image.nbytes * 4 // 3)
+            self._write(prefix + ".L0.raw", image)
+            # 메모리에 원본이 있을 때 축소 레벨을 만들어 두면 나중에 디스크를 다시 읽지 않아도 됨
+            level, k = image, 0
+            while max(level.shape[:2]) > MIN_LEVEL_SIDE:
+                k += 1
+                w, h = _level_size(size, k)
+                level = cv2.resize(level, (w, h), interpolation=cv2.INTER_AREA)
+                self._write(f"{prefix}.L{k}.raw", level)
+        return self._map(prefix + ".L0.raw", size)
+
+    def level(self, base, k):
+        """base(원본 memmap)의 k번째 피라미드 레벨 memmap (없으면 이전 레벨에서 행 단위로 축소해 만든다)"""
+        prefix = base.filename[:-len(".L0.raw")]
+        size = (base.shape[1], base.shape[0])
+        path = f"{prefix}.L{k}.raw"
+        if not os.path.exists(path):
+            prev = self.level(base, k - 1) if k > 1 else base
+            w, h = _level_size(size, k)
+            out = np.memmap(path + ".tmp", dtype=np.uint8, mode="w+", shape=(h, w, 3))
+            for y in range(0, h, STRIP_ROWS // 2):
+                rows = min(STRIP_ROWS // 2, h - y)
+                out[y:y + rows] = cv2.resize(prev[2 * y:2 * (y + rows), :2 * w], (w, rows), interpolation=cv2.INTER_AREA)
+            out.flush()
+            del out
+            os.replace(path + ".tmp", path)
+        return self._map(path, _level_size(size, k))
+
+    def _write(self, path, image):
+        """image를 행 단위로 나눠 파일에 쓴다 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with span("write", image.nbytes, path=path), open(tmp_path, "wb") as f:
+            for y in range(0, image.shape[0], STRIP_ROWS):
+                f.write(np.ascontiguousarray(image[y:y + STRIP_ROWS]).data)
+        os.replace(tmp_path, path)
+
+    def _trim(self, incoming_bytes):
+        """예산을 넘지 않도록 오래 안 쓴 이미지의 파일부터 삭제"""
+        groups = {}
+        for path in glob.glob(os.path.join(self.folder, "*.raw")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            prefix = path.rsplit(".L", 1)[0]
+            nbytes, mtime = groups.get(prefix, (0, 0))
+            groups[prefix] = (nbytes + stat.st_size, max(mtime, stat.st_mtime))
+        total = sum(nbytes for nbytes, _ in groups.values()) + incoming_bytes
+        for prefix, (nbytes, _) in sorted(groups.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            for path in glob.glob(glob.escape(prefix) + ".L*.raw"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue  # 다른 창에서 열려 있는 파일 (Windows)
+            total -= nbytes
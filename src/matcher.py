@@ -0,0 +1,180 @@
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from core import lazy_import
+from timing import span, record
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+MATCH_METHODS = ("CCOEFF_NORMED", "CCORR_NORMED", "SQDIFF_NORMED")  # cv2.TM_* 이름
+MIN_TEMPLATE_SIZE = 12  # 축소 레벨에서 템플릿 한 변의 최소 크기
+MAX_LEVELS = 4  # 최대 축소 단계 (1/16)
+TOP_K = 3  # 가장 작은 레벨에서 뽑아 정밀 검색할 후보 수
+REFINE_MARGIN = 3  # 한 단계 올라갈 때 후보 주변 탐색 여유 (픽셀)
+SIMILAR_SCORE = 0.9  # count_similar: 이 점수 이상이면 닮은 위치
+MAX_SIMILAR = 20  # count_similar: 이 이상은 세지 않음
+
+
+@dataclass
+class MatchResult:
+    x: int  # 원본 이미지 좌표 (템플릿 좌상단)
+    y: int
+    w: int
+    h: int
+    score: float  # 최고 점수 (1에 가까울수록 일치, SQDIFF는 1 - 값으로 변환)
+    second_score: Optional[float]  # 다른 위치의 두 번째 점수 (1에 가까울수록 헷갈리는 템플릿)
+    elapsed_ms: float
+    levels: int  # 사용한 축소 단계 수 (0이면 원본에서만 검색)
+    method: str = "CCOEFF_NORMED"
+
+    @property
+    def uniqueness(self):
+        """최고 점수와 두 번째 점수의 차 (클수록 유일한 템플릿)"""
+        if self.second_score is None:
+            return self.score
+        return self.score - self.second_score
+
+
+class TemplateMatcher:
+    """이미지 1장에 대한 템플릿 매칭 (피라미드 coarse-to-fine)
+
+    가장 작은 레벨에서 전체를 검색해 후보 TOP_K개를 고르고,
+    한 단계씩 원본 해상도로 올라가며 후보 주변만 다시 검색한다.
+    흑백 피라미드는 이미지별로 한 번만 만든다.
+    """
+
+    def __init__(self, image, grayscale=True):
+        self.image = image
+        self.grayscale = grayscale
+        self._pyramid = []  # 처음 match 할 때 만든다 (UI 스레드에서 생성만 하고 작업은 워커에서)
+
+    def _level(self, k):
+        if not self._pyramid:
+            with span("color_convert", self.image.nbytes):
+                self._pyramid.append(cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY) if self.grayscale else self.image)
+        while len(self._pyramid) <= k:
+            self._pyramid.append(cv2.pyrDown(self._pyramid[-1]))
+        return self._pyramid[k]
+
+    def _prepare_template(self, template):
+        if self.grayscale and template.ndim == 3:
+            return cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+        return template
+
+    @staticmethod
+    def _match(search, template, method):
+        result = cv2.matchTemplate(search, template, getattr(cv2, "TM_" + method))
+        if method.startswith("SQDIFF"):
+            result = 1.0 - result  # 모든 방식에서 클수록 좋은 점수로 통일
+        return result
+
+    @staticmethod
+    def _top_candidates(result, tw, th, k):
+        """점수 맵에서 서로 템플릿 크기 이상 떨어진 상위 k개 위치 (비최대 억제)"""
+        result = result.copy()
+        candidates = []
+        for _ in range(k):
+            _, score, _, (x, y) = cv2.minMaxLoc(result)
+            if not np.isfinite(score):
+                break
+            candidates.append((x, y, float(score)))
+            result[max(0, y - th + 1):y + th, max(0, x - tw + 1):x + tw] = -np.inf
+        return candidates
+
+    @staticmethod
+    def _coarsest_level(tw, th, sw, sh):
+        """템플릿이 너무 작아지지 않는 범위에서 가장 작은 레벨"""
+        levels = 0
+        while (levels < MAX_LEVELS and min(tw, th) >> (levels + 1) >= MIN_TEMPLATE_SIZE
+               and (sw >> (levels + 1)) >= (tw >> (levels + 1)) + 1 and (sh >> (levels + 1)) >= (th >> (levels + 1)) + 1):
+            levels += 1
+        return levels
+
+    def _refine(self, candidates, templates, search_region, method):
+        """fine: 가장 작은 레벨의 후보에서 한 단계씩 올라가며 후보 주변만 검색 (원본 좌표 후보 반환)"""
+        sx, sy, sw, sh = search_region
+        for k in range(len(templates) - 2, -1, -1):
+            level_img = self._level(k)
+            t = templates[k]
+            t_h, t_w = t.shape[:2]
+            # 검색 영역(레벨 k 좌표)
+            rx0, ry0 = sx >> k, sy >> k
+            rx1, ry1 = rx0 + (sw >> k), ry0 + (sh >> k)
+            refined = []
+            for cx, cy, _ in candidates:
+                cx, cy = cx * 2, cy * 2
+                wx0 = max(rx0, cx - REFINE_MARGIN)
+                wy0 = max(ry0, cy - REFINE_MARGIN)
+                wx1 = min(rx1, cx + t_w + REFINE_MARGIN + 1)
+                wy1 = min(ry1, cy + t_h + REFINE_MARGIN + 1)
+                window = level_img[wy0:wy1, wx0:wx1]
+                if window.shape[0] < t_h or window.shape[1] < t_w:
+                    continue
+                _, score, _, (bx, by) = cv2.minMaxLoc(self._match(window, t, method))
+                refined.append((wx0 + bx, wy0 + by, float(score)))
+            candidates = refined
+        return candidates
+
+    def count_similar(self, template, threshold=SIMILAR_SCORE, max_count=MAX_SIMILAR, method="CCOEFF_NORMED"):
+        """이미지 전체에서 template과 threshold 이상 닮은, 서로 겹치지 않는 위치 수 (자기 자신 포함)
+
+        가장 작은 레벨에서 상위 max_count개 후보를 고른 뒤 원본 해상도에서 점수를 다시 잰 추정치
+        """
+        template = self._prepare_template(template)
+        th, tw = template.shape[:2]
+        full = self._level(0)
+        search_region = (0, 0, full.shape[1], full.shape[0])
+        if tw > full.shape[1] or th > full.shape[0]:
+            return 0
+        levels = self._coarsest_level(tw, th, full.shape[1], full.shape[0])
+        templates = [template]
+        for _ in range(levels):
+            templates.append(cv2.pyrDown(templates[-1]))
+        with span("count_similar", levels=levels):
+            t = templates[-1]
+            candidates = self._top_candidates(self._match(self._level(levels), t, method), t.shape[1], t.shape[0], max_count)
+            candidates = self._refine(candidates, templates, search_region, method)
+        # 서로 다른 후보가 정밀 검색에서 같은 위치로 모일 수 있으므로 위치로 중복 제거
+        return len({(x, y) for x, y, score in candidates if score >= threshold})
+
+    def match(self, template, search_region: Optional[Tuple[int, int, int, int]] = None, method="CCOEFF_NORMED"):
+        """template을 이미지(또는 search_region 안)에서 찾는다, 찾을 수 없으면 None"""
+        start = time.perf_counter()
+        template = self._prepare_template(template)
+        th, tw = template.shape[:2]
+
+        full = self._level(0)
+        if search_region is None:
+            sx, sy, sw, sh = 0, 0, full.shape[1], full.shape[0]
+        else:
+            sx, sy, sw, sh = search_region
+            sx, sy = max(0, sx), max(0, sy)
+            sw, sh = min(sw, full.shape[1] - sx), min(sh, full.shape[0] - sy)
+        if tw > sw or th > sh:
+            return None
+
+        levels = self._coarsest_level(tw, th, sw, sh)
+        templates = [template]
+        for _ in range(levels):
+            templates.append(cv2.pyrDown(templates[-1]))
+
+        # coarse: 가장 작은 레벨에서 검색 영역 전체
+        k = levels
+        level_img = self._level(k)
+        x0, y0 = sx >> k, sy >> k
+        search = level_img[y0:y0 + (sh >> k), x0:x0 + (sw >> k)]
+        t = templates[k]
+        candidates = [(x + x0, y + y0, score)
+                      for x, y, score in self._top_candidates(self._match(search, t, method), t.shape[1], t.shape[0], TOP_K)]
+
+        candidates = self._refine(candidates, templates, (sx, sy, sw, sh), method)
+        if not candidates:
+            return None
+        candidates.sort(key=lambda c: c[2], reverse=True)
+        best_x, best_y, best_score = candidates[0]
+        # 두 번째 점수: 최고 위치와 겹치지 않는 후보 중 최고
+        second = next((score for x, y, score in candidates[1:]
+                       if abs(x - best_x) >= tw // 2 or abs(y - best_y) >= th // 2), None)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        record("match", start, time.perf_counter(), template.nbytes, levels=levels, method=method)
+        return MatchResult(best_x, best_y, tw, th, best_score, second, elapsed_ms, levels, method)
@@ -0,0 +1,73 @@
+import os
+import sys
+
+
+def format_bytes(nbytes):
+    """바이트 수를 읽기 쉬운 문자열로 (예: 1.5 GB)"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(nbytes) < 1024 or unit == "GB":
+            return f"{nbytes:.1f} {unit}" if unit != "B" else f"{nbytes} B"
+        nbytes /= 1024
+
+
+def _windows_memory_counters():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return None
+    return counters
+
+
+def _proc_status_bytes(field):
+    """/proc/self/status 의 kB 값 (Linux)"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    return None
+
+
+def current_rss_bytes():
+    """현재 프로세스가 점유한 물리 메모리 (알 수 없으면 None)"""
+    try:
+        if sys.platform == "win32":
+            counters = _windows_memory_counters()
+            return counters.WorkingSetSize if counters else None
+        if os.path.exists("/proc/self/status"):
+            return _proc_status_bytes("VmRSS")
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_bytes():
+    """프로세스 시작 후 최대 물리 메모리 사용량 (알 수 없으면 None)"""
+    try:
+        if sys.platform == "win32":
+            counters = _windows_memory_counters()
+            return counters.PeakWorkingSetSize if counters else None
+        if os.path.exists("/proc/self/status"):
+            return _proc_status_bytes("VmHWM")
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # macOS는 bytes, 그 외 KB
+    except (OSError, ImportError):
+        return None
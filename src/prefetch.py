@@ -0,0 +1,141 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from core import lazy_import
+from cache import LRUCache
+from preview import read_image_size
+from large_image import is_large_image
+from timing import span
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+DEFAULT_DECODE_CACHE_BYTES = 512 * 1024 * 1024  # 디코딩된 이미지 캐시 예산
+DEFAULT_PREFETCH_COUNT = 2  # 앞/뒤 방향으로 각각 미리 디코딩할 이미지 수
+MAX_FAILED_KEYS = 256  # 디코딩에 실패한 (경로, 수정시각)을 기억할 최대 개수
+
+
+def decode_image(file_path):
+    """이미지 파일 디코딩 (한글 경로 지원), 실패 시 None"""
+    image_array = np.fromfile(file_path, dtype=np.uint8)
+    return cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+
+
+class ImagePrefetcher:
+    """이미지를 백그라운드 스레드에서 디코딩해서 LRU 캐시에 보관한다.
+
+    cv2.imdecode는 GIL을 놓고 동작하므로 스레드 풀로 충분히 병렬 처리된다.
+    캐시 키는 (경로, 수정시각)이라 파일이 바뀌면 다시 디코딩한다.
+    디코딩에 실패한 키도 기억해서 손상된 파일을 이웃 미리 디코딩 때마다 다시 읽지 않는다.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_DECODE_CACHE_BYTES, workers=2, prefetch_count=DEFAULT_PREFETCH_COUNT):
+        self.cache = LRUCache(max_bytes)
+        self.prefetch_count = prefetch_count
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._futures = {}  # key -> Future (디코딩 중인 작업)
+        self._failed = {}  # 디코딩 실패한 key (삽입 순서, 오래된 것부터 버림)
+        self._lock = threading.Lock()
+
+    def set_budget(self, max_bytes, prefetch_count):
+        """캐시 예산과 미리 디코딩할 이웃 수 변경"""
+        self.cache.set_max_bytes(max_bytes)
+        self.prefetch_count = prefetch_count
+
+    @staticmethod
+    def _key(file_path):
+        try:
+            return (os.path.normcase(os.path.abspath(file_path)), os.path.getmtime(file_path))
+        except OSError:
+            return None
+
+    def get(self, file_path):
+        """캐시된 이미지 반환 (없으면 None, 디코딩하지 않음)"""
+        key = self._key(file_path)
+        if key is None:
+            return None
+        return self.cache.get(key)
+
+    def request(self, file_path, callback=None):
+        """file_path 디코딩을 요청한다. 완료되면 워커 스레드에서 callback(file_path, image) 호출
+
+        이미 캐시에 있으면 바로 callback을 호출하고, 디코딩 중이면 그 작업에 callback만 붙인다.
+        """
+        key = self._key(file_path)
+        if key is None:
+            if callback:
+                callback(file_path, None)
+            return
+
+        image = self.cache.get(key)
+        if image is not None:
+            if callback:
+                callback(file_path, image)
+            return
+
+        with self._lock:
+            failed = key in self._failed
+        if failed:
+            if callback:
+                callback(file_path, None)
+            return
+
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._executor.submit(self._decode, key, file_path)
+                self._futures[key] = future
+
+        if callback:
+            future.add_done_callback(lambda f: callback(file_path, f.result() if not f.cancelled() and f.exception() is None else None))
+
+    def prefetch(self, file_paths):
+        """주어진 파일들을 미리 디코딩 (결과는 캐시에만 넣음, 대용량 이미지는 제외)"""
+        for file_path in file_paths:
+            if is_large_image(read_image_size(file_path)):
+                continue
+            self.request(file_path)
+
+    def neighbors(self, sorted_files, index):
+        """탐색 순서(sorted_files)에서 index의 앞/뒤 prefetch_count개 (가까운 것부터)"""
+        count = len(sorted_files)
+        neighbors = []
+        for step in range(1, self.prefetch_count + 1):
+            for direction in (1, -1):
+                neighbor = sorted_files[(index + direction * step) % count]
+                if neighbor not in neighbors and neighbor != sorted_files[index]:
+                    neighbors.append(neighbor)
+        return neighbors
+
+    def prefetch_neighbors(self, sorted_files, index):
+        """탐색 순서(sorted_files)에서 index의 앞/뒤 prefetch_count개를 미리 디코딩 (가까운 것부터)"""
+        self.prefetch(self.neighbors(sorted_files, index))
+
+    def discard(self, file_path):
+        """file_path의 디코딩 결과를 캐시에서 뺀다 (대용량 이미지를 디스크로 옮긴 뒤)"""
+        key = self._key(file_path)
+        if key is not None:
+            self.cache.pop(key)
+            with self._lock:
+                self._failed.pop(key, None)
+
+    def _decode(self, key, file_path):
+        try:
+            with span("decode", path=file_path) as s:
+                image = decode_image(file_path)
+                if image is not None:
+                    s.nbytes = image.nbytes
+            if image is not None:
+                self.cache.put(key, image, image.nbytes)
+            else:
+                with self._lock:
+                    self._failed[key] = True
+                    if len(self._failed) > MAX_FAILED_KEYS:
+                        del self._failed[next(iter(self._failed))]
+            return image
+        finally:
+            with self._lock:
+                self._futures.pop(key, None)
+
+    def shutdown(self):
+        """대기 중인 작업을 취소하고 스레드 풀 종료"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
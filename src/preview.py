@@ -0,0 +1,138 @@
+import hashlib
+import os
+import struct
+import sys
+import threading
+from core import lazy_import
+from timing import span
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+PREVIEW_SIDE = 1280  # 미리보기 긴 변 목표 크기 (이보다 2배 이상 큰 이미지만 미리보기 사용)
+THUMBNAIL_QUALITY = 85  # 썸네일 JPEG 품질
+_JPEG_EXTENSIONS = (".jpg", ".jpeg")
+_REDUCED_MODES = ((8, "IMREAD_REDUCED_COLOR_8"), (4, "IMREAD_REDUCED_COLOR_4"), (2, "IMREAD_REDUCED_COLOR_2"))
+
+
+def read_image_size(file_path):
+    """파일 헤더만 읽어서 (width, height) 반환 (PNG/JPEG/BMP, 모르면 None)"""
+    try:
+        with open(file_path, "rb") as f:
+            head = f.read(26)
+            if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+                return struct.unpack(">II", head[16:24])
+            if head[:2] == b"BM" and len(head) >= 26:
+                width, height = struct.unpack("<ii", head[18:26])
+                return width, abs(height)  # 높이가 음수면 위에서 아래로 저장된 BMP
+            if head[:2] == b"\xff\xd8":
+                return _jpeg_size(f)
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def _jpeg_size(f):
+    """JPEG 마커를 따라가며 SOF 세그먼트의 크기를 찾는다"""
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code == 0xFF:  # 채움 바이트
+            f.seek(-1, os.SEEK_CUR)
+            continue
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:  # 길이 없는 마커
+            continue
+        length = struct.unpack(">H", f.read(2))[0]
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">xHH", f.read(5))
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def needs_preview(size):
+    """미리보기를 쓸 만큼 큰 이미지인지"""
+    return size is not None and max(size) >= PREVIEW_SIDE * 2
+
+
+def has_reduced_decode(file_path):
+    """축소 디코딩이 빠른 형식인지 (JPEG, 썸네일 저장 불필요)"""
+    return file_path.lower().endswith(_JPEG_EXTENSIONS)
+
+
+def decode_reduced(file_path, size):
+    """JPEG는 libjpeg의 축소 디코딩(1/2, 1/4, 1/8)으로 빠르게 미리보기를 만든다 (다른 형식은 None)"""
+    if not has_reduced_decode(file_path):
+        return None
+    for factor, mode in _REDUCED_MODES:
+        if max(size) // factor >= PREVIEW_SIDE:
+            return cv2.imdecode(np.fromfile(file_path, dtype=np.uint8), getattr(cv2, mode))
+    return None
+
+
+def app_cache_dir(name):
+    """로컬 디스크의 캐시 폴더 (Windows: %LOCALAPPDATA%\\SophiaCapture\\name)"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+        return os.path.join(base, "SophiaCapture", name)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "sophia-capture", name)
+
+
+class ThumbnailCache:
+    """축소 이미지를 디스크에 JPEG로 보관한다 (키: 경로 + 파일 크기 + 수정시각)
+
+    원본 파일이 바뀌면 키가 달라져서 자동으로 다시 만든다.
+    """
+
+    def __init__(self, folder=None, max_side=PREVIEW_SIDE):
+        self.folder = folder or app_cache_dir("thumbnails")
+        self.max_side = max_side
+
+    def _path(self, file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        key = f"{os.path.normcase(os.path.abspath(file_path))}|{stat.st_size}|{stat.st_mtime_ns}|{self.max_side}"
+        return os.path.join(self.folder, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".jpg")
+
+    def get(self, file_path):
+        """저장된 썸네일 (없으면 None)"""
+        path = self._path(file_path)
+        if path is None or not os.path.exists(path):
+            return None
+        return cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    def put(self, file_path, image):
+        """image(원본 디코딩 결과)를 축소해서 저장 (워커 스레드에서 호출)"""
+        path = self._path(file_path)
+        if path is None or os.path.exists(path):
+            return
+        h, w = image.shape[:2]
+        ratio = self.max_side / max(w, h)
+        if ratio < 1:
+            image = cv2.resize(image, (max(1, int(w * ratio)), max(1, int(h * ratio))), interpolation=cv2.INTER_AREA)
+        with span("thumbnail_encode", image.nbytes):
+            ret, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, THUMBNAIL_QUALITY])
+        if not ret:
+            return
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with span("write", buffer.nbytes, path=path):
+                buffer.tofile(tmp_path)
+            os.replace(tmp_path, path)  # 다른 스레드가 반쯤 쓴 파일을 읽지 않도록
+        except OSError as e:
+            print(f"warning: 썸네일 저장 실패: {e}")
+
+
+def load_preview(file_path, size, thumbnails):
+    """빠르게 얻을 수 있는 미리보기 (JPEG 축소 디코딩 -> 디스크 썸네일 순), 없으면 None"""
+    if not needs_preview(size):
+        return None
+    preview = decode_reduced(file_path, size)
+    if preview is None:
+        preview = thumbnails.get(file_path)
+    return preview
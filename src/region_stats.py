@@ -0,0 +1,67 @@
+import math
+from core import lazy_import
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+FLAT_STD = 8.0  # 밝기 표준편차가 이보다 작으면 평평한 영역 (템플릿으로 쓰면 매칭이 불안정)
+COLOR_LEVELS = 4  # 색 히스토그램: 채널당 단계 수 (4 -> 64색)
+TOP_COLORS = 3
+
+
+class RegionStats:
+    """이미지 1장의 흑백 적분 영상(합, 제곱합), 임의 사각형의 평균/표준편차를 O(1)로
+
+    sum[y, x] = 원본 [0, y) x [0, x) 밝기 합 이므로 사각형 합은 모서리 4개 값의 덧셈/뺄셈이다.
+    메모리: 픽셀당 12바이트 (int32 합 + float64 제곱합)
+    """
+
+    def __init__(self, image):
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        h, w = gray.shape
+        sdepth = cv2.CV_32S if w * h * 255 < 2 ** 31 else cv2.CV_64F
+        self._sum, self._sqsum = cv2.integral2(gray, sdepth=sdepth, sqdepth=cv2.CV_64F)
+        self.width, self.height = w, h
+
+    @property
+    def nbytes(self):
+        return self._sum.nbytes + self._sqsum.nbytes
+
+    def mean_std(self, x, y, w, h):
+        """사각형 (x, y, w, h)의 밝기 평균과 표준편차 (이미지 밖은 잘라냄, 비면 None)"""
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.width, x + w), min(self.height, y + h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        n = (x1 - x0) * (y1 - y0)
+        s, q = self._sum, self._sqsum
+        total = float(s[y1, x1]) - float(s[y0, x1]) - float(s[y1, x0]) + float(s[y0, x0])
+        squares = q[y1, x1] - q[y0, x1] - q[y1, x0] + q[y0, x0]
+        mean = total / n
+        return mean, math.sqrt(max(0.0, squares / n - mean * mean))
+
+
+def is_flat(image):
+    """이미지 전체 밝기 표준편차가 FLAT_STD보다 작은지 (단색 배경, 빈 패널 등)"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    _, std = cv2.meanStdDev(gray)
+    return float(std[0, 0]) < FLAT_STD
+
+
+def color_histogram(image, levels=COLOR_LEVELS):
+    """BGR 이미지를 채널당 levels 단계로 줄인 색 히스토그램 [(비율, (b, g, r) 대표색), ...] (많은 순)"""
+    step = 256 // levels
+    q = (image // step).reshape(-1, 3).astype(np.int32)
+    counts = np.bincount((q[:, 0] * levels + q[:, 1]) * levels + q[:, 2], minlength=levels ** 3)
+    order = np.argsort(counts)[::-1]
+    total = counts.sum()
+    result = []
+    for code in order[:np.count_nonzero(counts)].tolist():
+        b, g, r = code // (levels * levels), (code // levels) % levels, code % levels
+        result.append((counts[code] / total, (b * step + step // 2, g * step + step // 2, r * step + step // 2)))
+    return result
+
+
+def format_colors(histogram, top=TOP_COLORS):
+    """color_histogram 결과 요약 (예: "#e0e0e0 62%, #202020 20% / 5색")"""
+    parts = [f"#{r:02x}{g:02x}{b:02x} {ratio * 100:.0f}%" for ratio, (b, g, r) in histogram[:top]]
+    return f"{', '.join(parts)} / {len(histogram)}색"
@@ -1,15 +1,37 @@
 import datetime
 import sys
 import os
+import time
 import traceback
-import cv2
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from PySide6.QtWidgets import (QApplication, QMainWindow, QLabel, QFileDialog, 
                                QScrollArea, QVBoxLayout, QWidget, QToolBar, QPushButton, 
-                               QTextEdit, QStatusBar, QHBoxLayout, QSplitter, QRubberBand, QSizePolicy, QMessageBox, QLineEdit)
-from PySide6.QtGui import QPixmap, QImage, QFont, QIcon, QCursor, QAction
-from PySide6.QtCore import Qt, QRect, QPoint, QSize
-from utils import PosUtil, RegionName, get_region, get_save_path
+                               QStatusBar, QHBoxLayout, QSplitter, QSizePolicy, QMessageBox, QLineEdit, QComboBox,
+                               QDialog, QPlainTextEdit)
+from PySide6.QtGui import QPixmap, QImage, QFont, QIcon, QCursor, QAction, QPainter, QPen, QColor, QBrush
+from PySide6.QtCore import Qt, QRect, QPoint, QSize, QRectF, QLineF, QTimer, Signal, QFileSystemWatcher, QEvent
+from core import RegionName, get_region, get_save_path, lazy_import
+from utils import PosUtil
+from tile_renderer import TileRenderer
+from zoom_cache import ZoomCache, quantize_scale, ZOOM_STEP, DEFAULT_ZOOM_CACHE_BYTES, LOW_MEMORY_ZOOM_CACHE_BYTES
+from prefetch import ImagePrefetcher, decode_image, DEFAULT_DECODE_CACHE_BYTES, DEFAULT_PREFETCH_COUNT
+from dir_index import FolderIndexes
+from capture_writer import CaptureWriter
+from memory_stats import current_rss_bytes, peak_rss_bytes, format_bytes
+from annotations import AnnotationStore
+from matcher import TemplateMatcher
+from large_image import MappedImageStore, is_large_image
+from info_log import InfoLogModel, InfoLogView, InfoKind, InfoEntry
+from journal import ImageJournal, JournalLoader, journal_path
+from dup_index import HashIndex, HashIndexLoader, dhash, HASH_FILE_NAME
+from thumbnail_strip import ThumbnailLoader, ThumbnailStripModel, ThumbnailStrip, STRIP_THUMB_SIDE
+from edge_snap import EdgeMap, SNAP_RADIUS
+from region_stats import RegionStats, FLAT_STD, color_histogram, format_colors, is_flat
+from watch_folder import StableFileTracker, STABLE_CHECK_MS
+from preview import ThumbnailCache, read_image_size, needs_preview, has_reduced_decode, load_preview
+import timing
+from timing import span
+np = lazy_import("numpy")  # cv2/numpy는 첫 이미지를 열 때 import (시작 시간 단축)
 
 
 VERSION = "0.9"
@@ -21,38 +43,119 @@ def apply_monitor_scale(pos):
     scaled_y = pos.y() * device_scale  # 🔥 곱하기
     return scaled_x, scaled_y
 
+def bgr_to_qimage(image):
+    """ BGR numpy 배열을 복사 없이 감싼 QImage (Format_BGR888)
+
+    QImage는 image의 메모리를 그대로 참조하므로 image가 살아있는 동안만 사용할 것.
+    (QPixmap.fromImage 처럼 픽셀을 복사해 가는 곳에 바로 넘기는 용도)
+    """
+    h, w = image.shape[:2]
+    stride = image.strides[0]
+    if image.flags.c_contiguous:
+        buffer = image.data
+    else:
+        # 원본의 부분 view(1:1 타일): 행 간격(stride)을 유지한 채 필요한 바이트 구간만 1차원으로 넘김
+        buffer = np.lib.stride_tricks.as_strided(image, shape=((h - 1) * stride + w * 3,), strides=(1,)).data
+    return QImage(buffer, w, h, stride, QImage.Format_BGR888)
+
+def same_folder(a, b):
+    return a is not None and b is not None and os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+MARK_HALF = 8  # + 마크 반 길이 (화면 픽셀)
+MARK_PEN = QPen(QColor("red"), 2)
+REGION_PEN = QPen(QColor("red"), 2)
+QUEUED_PEN = QPen(QColor("orange"), 2, Qt.DashLine)  # 내보내기를 기다리는 영역
+RUBBER_BAND_PEN = QPen(QColor("red"), 2, Qt.DashLine)
+RUBBER_BAND_BRUSH = QBrush(QColor(255, 0, 0, 50))
+
 class CustomLabel(QLabel):
-    """ (요구사항 3) Rubber Band (점선 사각형) 구현 """
+    """ 이미지 타일 + 마크/region/Rubber Band(점선 사각형)를 한 번의 paintEvent로 그림 """
     def __init__(self, parent=None):
         print("SophiaCapture Initialized")  # 프로그램이 실행되었는지 확인
         super().__init__(parent)
         self.setMouseTracking(True)
-        self.rubber_band = QRubberBand(QRubberBand.Rectangle, self)  
-        self.rubber_band.setStyleSheet("border: 2px dashed red; background: rgba(255, 0, 0, 50);")
+        self.rubber_rect = None  # Rubber Band (화면 좌표 QRect), 없으면 None
         self.start_pos = None
         self.parent_window = parent  
 
+        # 마우스 이동마다 조회하지 않도록 DPI 배율과 이미지 크기를 캐시 (화면/DPI 변경 시 갱신)
+        self.device_scale = PosUtil.device_scale()
+        self.image_width = 0
+        self.image_height = 0
+        QApplication.instance().primaryScreenChanged.connect(self.refresh_device_scale)
+
+        # 마우스 이동은 마지막 위치만 기억했다가 화면 갱신 주기마다 한 번 처리
+        self.pending_move_pos = None
+        self.move_timer = QTimer(self)
+        self.move_timer.setSingleShot(True)
+        self.move_timer.timeout.connect(self.flush_mouse_move)
+
+        # 타일 렌더링: 보이는 영역(+여유)의 타일만 QPixmap으로 만든다 (캐시는 parent_window.zoom_cache)
+        self.pending_tiles = []  # 여유 영역에서 미리 만들 타일
+        self.tile_timer = QTimer(self)
+        self.tile_timer.setSingleShot(True)
+        self.tile_timer.timeout.connect(self.prefill_tiles)
+
         if not hasattr(self.parent_window, "original_image"):
             print("Error: parent_window does not have 'original_image'")
 
+    def set_image_bounds(self, width, height):
+        """ 원본 이미지 크기 캐시 (이미지 변경 시) """
+        self.image_width = width
+        self.image_height = height
+
+    def refresh_device_scale(self, *args):
+        """ 주 모니터 변경/DPI 변경 시 DPI 배율 다시 읽기 """
+        self.device_scale = PosUtil.device_scale()
+        self.update()
+
+    def event(self, event):
+        if event.type() in (QEvent.ScreenChangeInternal, QEvent.DevicePixelRatioChange):
+            self.refresh_device_scale()
+        return super().event(event)
+
+    def frame_interval(self):
+        """ 화면 1프레임 시간(ms) """
+        screen = self.screen() or QApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 0
+        return max(1, int(1000 / rate)) if rate > 0 else 16
+
     def mouseMoveEvent(self, event):
-        if self.parent_window.original_image is None:
+        if self.parent_window.tile_renderer is None:
+            return
+
+        # 상태바/Rubber Band 갱신은 프레임당 한 번으로 묶음
+        self.pending_move_pos = event.position()
+        if not self.move_timer.isActive():
+            self.move_timer.start(self.frame_interval())
+
+    def flush_mouse_move(self):
+        """ 모아둔 마지막 마우스 위치로 상태바와 Rubber Band 갱신 """
+        pos = self.pending_move_pos
+        self.pending_move_pos = None
+        if pos is None or self.parent_window.tile_renderer is None:
             return
 
-        disp_x, disp_y = PosUtil.display_pos(event.position())
-        image_x, image_y = PosUtil.image_pos(event.position(), self.parent_window.scale_factor)
+        disp_x, disp_y = PosUtil.display_pos(pos)
+        image_x, image_y = PosUtil.image_pos(pos, self.parent_window.scale_factor, self.device_scale)
 
         label_rect = self.rect()
         disp_x = max(0, min(disp_x, label_rect.width() - 1))
         disp_y = max(0, min(disp_y, label_rect.height() - 1))
 
         # 이미지 범위내에 있을 때만 좌표 표시
-        if 0 <= image_x < self.parent_window.original_image.shape[1] and 0 <= image_y < self.parent_window.original_image.shape[0]:
+        if 0 <= image_x < self.image_width and 0 <= image_y < self.image_height:
             self.parent_window.display_status_message(image_x, image_y)
         # rubber band
-        if self.rubber_band.isVisible():
-            self.rubber_band.setGeometry(QRect(self.start_pos, QPoint(disp_x, disp_y)).normalized())
-
+        if self.rubber_rect is not None:
+            edge_map = self.parent_window.snap_edge_map()
+            image_rect = self.selection_image_rect(disp_x, disp_y, edge_map)
+            if edge_map is not None:
+                # 가까운 경계에 붙인 원본 좌표 사각형을 그대로 표시 (놓았을 때 잘라낼 영역과 같음)
+                self.set_rubber_rect(self.image_rect_to_disp(image_rect))
+            else:
+                self.set_rubber_rect(QRect(self.start_pos, QPoint(disp_x, disp_y)).normalized())
+            self.parent_window.display_region_stats(image_rect)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton and (self.parent_window.rect_capture_mode or self.parent_window.image_capture_mode):
@@ -66,35 +169,37 @@ class CustomLabel(QLabel):
             self.start_pos.setY(max(0, min(self.start_pos.y(), label_rect.height() - 1)))
 
             # Rubber Band 초기화
-            self.rubber_band.setGeometry(QRect(self.start_pos, QSize(1, 1)))
-            self.rubber_band.show()
-            self.rubber_band.update()
+            self.set_rubber_rect(QRect(self.start_pos, QSize(1, 1)))
 
-        if event.button() == Qt.LeftButton and self.parent_window.mark_mode:
+        if self.parent_window.mark_mode and event.button() in (Qt.LeftButton, Qt.RightButton):
             # 화면 표시용 좌표
             disp_x, disp_y = PosUtil.display_pos(event.position())
 
             # 화면 표시용 좌표 -> 원본 이미지 좌표 변환
-            image_x, image_y = PosUtil.disp_to_image_pos(disp_x, disp_y, self.parent_window.scale_factor)
-
-            # 마크 생성
-            mark = QLabel("+", self)
-            mark.setStyleSheet("color: red; font-size: 16px; font-weight: bold; text-align: center;")
-            mark.setAttribute(Qt.WA_TransparentForMouseEvents)
-            mark.setFixedSize(20, 20)
-
-            # 저장된 image 좌표를 표시용 좌표로 변환해서 마크 위치 설정
-            ui_x, ui_y = PosUtil.image_to_disp_pos(image_x, image_y, self.parent_window.scale_factor)
-            mark.move(ui_x - 10, ui_y - 10)  # 중앙 정렬
-            mark.show()
-
-            # mark_list에 저장 (mark 객체 + image 좌표)
-            self.parent_window.mark_list.append((mark, image_x, image_y))
-            self.parent_window.info_text.append(f"-----> Point({image_x}, {image_y})")
+            image_x, image_y = PosUtil.disp_to_image_pos(disp_x, disp_y, self.parent_window.scale_factor, self.device_scale)
+            annotations = self.parent_window.annotations
+
+            if event.button() == Qt.LeftButton:
+                # 마크 생성 (이미지 좌표로 저장, 그리기는 paintEvent)
+                annotations.add_mark(image_x, image_y)
+                self.parent_window.record("mark", x=image_x, y=image_y)
+                self.update_image_rect(image_x, image_y)
+                self.parent_window.info_log.add(InfoKind.POINT, image_x, image_y, prefix="-----> ")
+            else:
+                # 오른쪽 클릭: 가까운 마크 삭제
+                radius = max(1, int(MARK_HALF * self.image_per_disp()))
+                index = annotations.find_mark(image_x, image_y, radius)
+                if index is not None:
+                    mark_x, mark_y = annotations.mark(index)
+                    annotations.remove_mark(index)
+                    self.parent_window.record("mark_remove", x=mark_x, y=mark_y)
+                    self.update_image_rect(mark_x, mark_y)
+                    self.parent_window.info_log.add(InfoKind.POINT_REMOVED, mark_x, mark_y, prefix="-----> ")
 
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton and self.start_pos and (self.parent_window.rect_capture_mode or self.parent_window.image_capture_mode):
+            self.flush_mouse_move()
             disp_x, disp_y = PosUtil.display_pos(event.position())
             end_pos = QPoint(disp_x, disp_y)
 
@@ -102,45 +207,303 @@ class CustomLabel(QLabel):
             end_pos.setX(max(0, min(end_pos.x(), label_rect.width() - 1)))
             end_pos.setY(max(0, min(end_pos.y(), label_rect.height() - 1)))
 
-            # disp 좌표를 원본 이미지 좌표로 변환
-            start_image_x, start_image_y = PosUtil.disp_to_image_pos(self.start_pos.x(), self.start_pos.y(), self.parent_window.scale_factor)
-            end_image_x, end_image_y = PosUtil.disp_to_image_pos(end_pos.x(), end_pos.y(), self.parent_window.scale_factor)
-
-            # 이제 원본 이미지 기준으로 잘라야 할 rectangle 생성
-            selected_rect = QRect(QPoint(start_image_x, start_image_y), QPoint(end_image_x, end_image_y)).normalized()
+            # 원본 이미지 기준으로 잘라야 할 rectangle (경계 붙이기가 켜져 있으면 가까운 경계로)
+            selected_rect = self.selection_image_rect(end_pos.x(), end_pos.y(), self.parent_window.snap_edge_map())
 
             # 이 selected_rect를 원본 이미지에 적용
             self.parent_window.process_selection(selected_rect)
 
-            self.rubber_band.hide()
-            self.rubber_band.update()
+            self.set_rubber_rect(None)
+
+    def selection_image_rect(self, end_x, end_y, edge_map=None):
+        """ start_pos ~ (end_x, end_y) 화면 좌표를 원본 이미지 사각형으로, edge_map이 있으면 네 변을 가까운 경계로 """
+        scale = self.parent_window.scale_factor
+        start_x, start_y = PosUtil.disp_to_image_pos(self.start_pos.x(), self.start_pos.y(), scale, self.device_scale)
+        end_x, end_y = PosUtil.disp_to_image_pos(end_x, end_y, scale, self.device_scale)
+        rect = QRect(QPoint(start_x, start_y), QPoint(end_x, end_y)).normalized()
+        if edge_map is not None:
+            radius = max(1, int(SNAP_RADIUS * self.image_per_disp()))
+            x0, y0, x1, y1 = edge_map.snap_rect(rect.left(), rect.top(), rect.right(), rect.bottom(), radius)
+            rect = QRect(QPoint(x0, y0), QPoint(x1, y1))
+        return rect
+
+    def image_rect_to_disp(self, rect):
+        """ 원본 이미지 사각형(양 끝 픽셀 포함) -> 그 픽셀들을 덮는 화면 사각형 """
+        scale = self.parent_window.scale_factor
+        left, top = PosUtil.image_to_disp_pos(rect.left(), rect.top(), scale, self.device_scale)
+        right, bottom = PosUtil.image_to_disp_pos(rect.right() + 1, rect.bottom() + 1, scale, self.device_scale)
+        return QRect(QPoint(left, top), QPoint(max(left, right - 1), max(top, bottom - 1)))
+
+    def set_rubber_rect(self, rect):
+        """ Rubber Band 변경, 바뀐 부분만 다시 그림 (None이면 숨김) """
+        dirty = self.rubber_rect
+        self.rubber_rect = rect
+        if rect is not None:
+            dirty = rect if dirty is None else dirty.united(rect)
+        if dirty is not None:
+            self.update(dirty.adjusted(-2, -2, 2, 2))
+
+    def image_per_disp(self):
+        """ 화면 1픽셀 = 원본 이미지 몇 픽셀인지 """
+        return self.device_scale / self.parent_window.scale_factor
+
+    def update_image_rect(self, image_x, image_y):
+        """ 원본 이미지 좌표의 마크 주변만 다시 그림 """
+        disp_x, disp_y = PosUtil.image_to_disp_pos(image_x, image_y, self.parent_window.scale_factor, self.device_scale)
+        self.update(disp_x - MARK_HALF - 2, disp_y - MARK_HALF - 2, 2 * MARK_HALF + 5, 2 * MARK_HALF + 5)
+
+    def paint_annotations(self, painter, rect):
+        """ rect(화면 좌표) 안의 마크와 region만 골라서 그림 """
+        annotations = self.parent_window.annotations
+        per_disp = self.image_per_disp()
+        disp_per_image = 1.0 / per_disp
+
+        # 화면 영역 -> 원본 이미지 영역 (마크 크기만큼 여유)
+        margin = MARK_HALF + 2
+        x0 = int((rect.left() - margin) * per_disp)
+        y0 = int((rect.top() - margin) * per_disp)
+        x1 = int((rect.right() + margin) * per_disp) + 1
+        y1 = int((rect.bottom() + margin) * per_disp) + 1
+
+        regions = annotations.regions_in_rect(x0, y0, x1, y1)
+        if len(regions):
+            painter.setPen(REGION_PEN)
+            painter.setBrush(Qt.NoBrush)
+            for x, y, w, h in (regions * disp_per_image).tolist():
+                painter.drawRect(QRectF(x, y, w, h))
+
+        queued = annotations.queued_in_rect(x0, y0, x1, y1)
+        if len(queued):
+            painter.setPen(QUEUED_PEN)
+            painter.setBrush(Qt.NoBrush)
+            for x, y, w, h in (queued * disp_per_image).tolist():
+                painter.drawRect(QRectF(x, y, w, h))
+
+        xs, ys = annotations.marks_in_rect(x0, y0, x1, y1)
+        if len(xs):
+            painter.setPen(MARK_PEN)
+            lines = []
+            for x, y in zip((xs * disp_per_image).tolist(), (ys * disp_per_image).tolist()):
+                lines.append(QLineF(x - MARK_HALF, y, x + MARK_HALF, y))
+                lines.append(QLineF(x, y - MARK_HALF, x, y + MARK_HALF))
+            painter.drawLines(lines)
+
+    def reset_tiles(self):
+        """배율/이미지 변경 시 대기 중인 타일 작업 취소 후 다시 그리기"""
+        self.pending_tiles = []
+        self.tile_timer.stop()
+        self.update()
+
+    def tile_pixmap(self, renderer, col, row):
+        """타일 QPixmap 반환 (캐시에 없으면 리샘플링 -> QPixmap 생성)"""
+        zoom_cache = self.parent_window.zoom_cache
+        pixmap = zoom_cache.get_tile(renderer.scale, col, row)
+        if pixmap is None:
+            tile = renderer.render_tile(col, row)
+            # BGR 그대로 Qt에 넘김 (RGB 변환/중간 QImage 복사 없음), fromImage가 픽셀을 가져가므로 tile은 버려도 됨
+            with span("qpixmap", tile.shape[0] * tile.shape[1] * 3):
+                pixmap = QPixmap.fromImage(bgr_to_qimage(tile))
+            zoom_cache.put_tile(renderer.scale, col, row, pixmap)
+        return pixmap
+
+    def physical_rect(self, rect, margin=0):
+        """위젯(논리) 좌표 사각형 -> 표시 이미지(물리 픽셀) 좌표 (x, y, w, h)"""
+        dpr = self.devicePixelRatioF()
+        x0 = int(rect.left() * dpr) - margin
+        y0 = int(rect.top() * dpr) - margin
+        x1 = int((rect.right() + 1) * dpr + 0.999) + margin
+        y1 = int((rect.bottom() + 1) * dpr + 0.999) + margin
+        return x0, y0, x1 - x0, y1 - y0
+
+    def paintEvent(self, event):
+        renderer = self.parent_window.tile_renderer
+        if renderer is None:
+            super().paintEvent(event)
+            return
 
-    def update_mark_positions(self):
-        """확대/축소 시 마크 위치 업데이트"""
-        for mark_tuple in self.mark_list:
-            mark, image_x, image_y = mark_tuple
-            
-            # 원본 이미지 좌표에서 현재 스케일로 UI 좌표 계산
-            disp_x,disp_y = PosUtil.image_to_disp_pos(image_x, image_y, self.parent_window.scale_factor)
-            
-            # 마크 위치 업데이트
-            mark.move(disp_x - 10, disp_y - 10)
+        dpr = self.devicePixelRatioF()
+        with span("paint"):
+            painter = QPainter(self)
+            for col, row in renderer.tiles_in_rect(*self.physical_rect(event.rect())):
+                x, y, w, h = renderer.tile_rect(col, row)
+                pixmap = self.tile_pixmap(renderer, col, row)
+                # 타일은 물리 픽셀 크기이므로 논리 좌표로 나눠서 1:1로 그림
+                painter.drawPixmap(QRectF(x / dpr, y / dpr, w / dpr, h / dpr), pixmap, QRectF(0, 0, w, h))
+
+            # 마크/region/Rubber Band는 위젯 없이 같은 painter로 그림
+            self.paint_annotations(painter, event.rect())
+            if self.rubber_rect is not None:
+                painter.setPen(RUBBER_BAND_PEN)
+                painter.setBrush(RUBBER_BAND_BRUSH)
+                painter.drawRect(self.rubber_rect)
+            painter.end()
+
+        self.schedule_prefill(renderer)
+
+    def schedule_prefill(self, renderer):
+        """보이는 영역 주변(타일 1개 여유)의 타일을 유휴 시간에 미리 만든다"""
+        visible = self.visibleRegion().boundingRect()
+        if visible.isEmpty():
+            return
+        wanted = renderer.tiles_in_rect(*self.physical_rect(visible, margin=renderer.tile_size))
+
+        zoom_cache = self.parent_window.zoom_cache
+        self.pending_tiles = [(col, row) for col, row in wanted if not zoom_cache.has_tile(renderer.scale, col, row)]
+        if self.pending_tiles and not self.tile_timer.isActive():
+            self.tile_timer.start(0)
+
+    def prefill_tiles(self):
+        """대기 중인 타일을 하나씩 만든다 (UI가 멈추지 않도록 한 번에 하나)"""
+        renderer = self.parent_window.tile_renderer
+        if renderer is None or not self.pending_tiles:
+            return
+        col, row = self.pending_tiles.pop(0)
+        self.tile_pixmap(renderer, col, row)
+        if self.pending_tiles:
+            self.tile_timer.start(0)
+
+class TimingDialog(QDialog):
+    """ 구간 시간 측정 요약 (Action > Timing Summary) """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Timing Summary")
+        self.resize(720, 360)
+        layout = QVBoxLayout(self)
+        self.summary_text = QPlainTextEdit()
+        self.summary_text.setReadOnly(True)
+        self.summary_text.setFont(QFont("Consolas", 9))
+        layout.addWidget(self.summary_text)
+
+        button_layout = QHBoxLayout()
+        for text, slot in (("Refresh", self.refresh), ("Clear", self.clear), ("Export Trace...", self.export_trace)):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+        self.refresh()
+
+    def refresh(self):
+        lines = timing.format_summary()
+        if not timing.is_enabled():
+            lines.insert(0, "(측정 꺼짐: Action > Record Timing 을 켜세요)")
+        self.summary_text.setPlainText("\n".join(lines))
+
+    def clear(self):
+        timing.clear()
+        self.refresh()
+
+    def export_trace(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Trace", "sophia_trace.json", "Chrome Trace (*.json);;All Files (*)")
+        if file_path:
+            try:
+                count = timing.export_chrome_trace(file_path)
+                QMessageBox.information(self, "Saved", f"{file_path} 저장 완료 ({count} spans)\nchrome://tracing 또는 ui.perfetto.dev 에서 열기")
+            except OSError as e:
+                QMessageBox.critical(self, "오류", f"파일 저장 실패: {e}")
 
 class SophiaCapture(QMainWindow):
+    # 백그라운드 디코딩 완료 (워커 스레드 -> UI 스레드)
+    image_decoded = Signal(str, object)
+    # 잘라낸 이미지 저장 완료/실패 (저장 경로, region 또는 오류 메세지)
+    capture_saved = Signal(str, object)
+    capture_failed = Signal(str, str)
+    # 작업 기록 재생 완료 (이미지 경로, JournalState)
+    journal_loaded = Signal(str, object)
+    # 잘라낸 이미지의 매칭 검증 결과 (region, MatchResult 또는 None)
+    match_finished = Signal(object, object)
+    # 경계 붙이기용 EdgeMap 완성 (만든 이미지, EdgeMap)
+    edge_map_ready = Signal(object, object)
+    # 적분 영상 완성 (만든 이미지, RegionStats), 선택 영역 점수 (region, 상태바 문자열)
+    region_stats_ready = Signal(object, object)
+    region_scored = Signal(object, str)
+    # 감시 폴더에 새로 생긴 파일 목록 (인덱스 워커 -> UI 스레드), 자동 잘라내기 저장 완료
+    watch_files_added = Signal(list)
+    # 이전/다음 이동할 이미지 (인덱스 워커 -> UI 스레드, 없으면 빈 문자열)
+    navigation_ready = Signal(str)
+    # 폴더 인덱스 구성/변경 (폴더, 정렬된 파일 목록), 썸네일 줄 갱신용
+    folder_files_changed = Signal(str, list)
+    watch_cropped = Signal(str)
+    # 여러 영역 한꺼번에 저장 완료 (결과 목록, 저장 폴더, 시작 시각, 중복 검사 요약)
+    export_finished = Signal(object, str, float, str)
+
     def __init__(self):
         super().__init__()
 
         self.VERSION = VERSION  # 버전 정보 추가
         # 이미지 관련 변수
-        self.original_image = None  # 원본 이미지
-        self.displayed_image = None  # 확대/축소용 이미지
+        self.original_image = None  # 원본 이미지 (확대/축소 화면은 타일 캐시로만 유지)
+        self.tile_renderer = None  # 현재 배율의 타일 렌더러
+        self.zoom_cache = None  # 이미지별 확대/축소 캐시 (피라미드 + 타일)
+        self.zoom_cache_bytes = DEFAULT_ZOOM_CACHE_BYTES  # 확대/축소 캐시 메모리 예산
+        self.low_memory_mode = False  # on : 캐시/미리 디코딩을 줄여 메모리 절약
+
+        # next/prev 이미지를 미리 디코딩해 두는 워커 풀 + 디코딩 캐시
+        self.prefetcher = ImagePrefetcher()
+        self.pending_open_path = None  # 디코딩을 기다리는 다음 이미지
+        self.pending_change_save_folder = False  # 디코딩 완료 후 저장 폴더를 바꿀지
+        self.save_folder = None  # 잘라낸 이미지 저장 폴더 (첫 이미지를 열 때 정해짐)
+        # 원본 디코딩 전에 보여줄 미리보기 (JPEG 축소 디코딩 또는 디스크 썸네일)
+        self.preview_image = None
+        self.preview_size = None  # 원본 (width, height), 파일 헤더에서 읽음
+        self.thumbnails = ThumbnailCache()
+        # 대용량 이미지(LARGE_IMAGE_PIXELS 이상)는 픽셀을 디스크에 두고 memmap으로 필요한 부분만 읽음
+        self.mapped_images = MappedImageStore()
+        self.image_decoded.connect(self.on_image_decoded)
+
+        # 폴더별 이미지 목록 인덱스 (탐색마다 listdir 하지 않고 watcher로 갱신)
+        self.folder_indexes = FolderIndexes()
+        self.dir_watcher = QFileSystemWatcher(self)
+        self.dir_watcher.directoryChanged.connect(self.on_directory_changed)
+        self.changed_folders = set()
+        self.dir_refresh_timer = QTimer(self)
+        self.dir_refresh_timer.setSingleShot(True)
+        self.dir_refresh_timer.timeout.connect(self.refresh_changed_folders)
+        self.navigation_steps = 0  # 아직 처리하지 않은 이전/다음 클릭 (+/-)
+        self.navigation_in_flight = False
+        self.navigation_ready.connect(self.on_navigation_ready)
+
+        # 감시 폴더: 새로 생긴 스크린샷이 다 써지면 최신 것을 표시 (+ 지정 영역 자동 잘라내기)
+        self.watch_folder = None
+        self.watch_crop_region = None  # 자동 잘라내기 영역 (x, y, w, h), None이면 표시만
+        self.watch_tracker = StableFileTracker()
+        self.watch_timer = QTimer(self)
+        self.watch_timer.timeout.connect(self.poll_watch_folder)
+        self.watch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="watch")
+        self.watch_received = 0
+        self.watch_cropped_count = 0
+        self.watch_files_added.connect(self.on_watch_files_added)
+        self.watch_cropped.connect(self.on_watch_cropped)
+
+        # 잘라낸 이미지는 백그라운드에서 인코딩/저장
+        self.capture_writer = CaptureWriter()
+        self.capture_saved.connect(self.on_capture_saved)
+        self.export_finished.connect(self.on_export_finished)
+
+        # 이미지를 열 때 백그라운드에서 계산하는 표: 경계 누적표(선택 사각형 붙이기), 적분 영상(영역 평균/표준편차)
+        self.edge_map = None
+        self.region_stats = None
+        self.scored_region = None  # 상태바에 점수를 표시할 마지막 선택 영역
+        self.analysis_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis")
+        self.edge_map_ready.connect(self.on_edge_map_ready)
+        self.region_stats_ready.connect(self.on_region_stats_ready)
+        self.region_scored.connect(self.on_region_scored)
+
+        # 라이브러리 전체의 잘라낸 이미지 해시 (거의 같은 캡처 표시/건너뛰기), 파일은 백그라운드에서 읽음
+        self.hash_index = HashIndex(os.path.join(self.capture_root(), HASH_FILE_NAME))
+        self.hash_index_loader = HashIndexLoader()
+        self.hash_index_loader.load(self.hash_index)
+        self.capture_failed.connect(self.on_capture_failed)
+
+        # 잘라낸 이미지가 원본에서 빠르고 유일하게 찾아지는지 백그라운드에서 검증
+        self.matcher = None  # 현재 이미지의 TemplateMatcher (open_process에서 교체)
+        self.match_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="match")
+        self.match_finished.connect(self.on_match_finished)
         self.scale_factor = 1.0
 
         self.mark_mode = False # on :클릭시 포인트에 + 표시
         self.cross_cursor_mode = False # on : 마우스 커서가 + 라인
-        self.mark_list = []  # 저장된 마크 리스트 + 리스트
+        self.annotations = AnnotationStore()  # 마크(+)와 사용자 region (원본 이미지 좌표)
         #사용자 region그리기
-        self.drawn_rect_label = None  # 사각형 표시용 QLabel
         self.last_drawn_region = None  # (x, y, w, h)        
 
         self.setWindowTitle(f"Sophia Capture v{self.VERSION}")  # 창 제목 설정
@@ -199,6 +562,12 @@ class SophiaCapture(QMainWindow):
         # Separator
         action_menu.addSeparator()
 
+        # 모아 둔 영역 중 마지막 것 취소
+        remove_queued_action = QAction("Remove Last Queued Region", self)
+        remove_queued_action.setShortcut("Ctrl+Z")
+        remove_queued_action.triggered.connect(self.remove_last_queued_region)
+        action_menu.addAction(remove_queued_action)
+
         # Clear info
         clear_info_action = QAction("Clear info", self)
         clear_info_action.triggered.connect(self.clear_info_text)
@@ -216,6 +585,55 @@ class SophiaCapture(QMainWindow):
         explore_folder_action.triggered.connect(self.explore_folder_action)
         action_menu.addAction(explore_folder_action)  # ✅ 최하단에 추가        
 
+        action_menu.addSeparator()
+
+        # 메모리 절약 모드
+        self.low_memory_action = QAction("Low Memory Mode", self)
+        self.low_memory_action.setCheckable(True)
+        self.low_memory_action.toggled.connect(self.set_low_memory_mode)
+        action_menu.addAction(self.low_memory_action)
+
+        # 메모리 사용량 표시
+        memory_info_action = QAction("Memory Info", self)
+        memory_info_action.triggered.connect(self.show_memory_info)
+        action_menu.addAction(memory_info_action)
+
+        # 구간 시간 측정 (기본 꺼짐, 환경변수 SOPHIA_TIMING=1 로 시작 시 켜기)
+        self.timing_action = QAction("Record Timing", self)
+        self.timing_action.setCheckable(True)
+        self.timing_action.setChecked(timing.is_enabled())
+        self.timing_action.toggled.connect(timing.enable)
+        action_menu.addAction(self.timing_action)
+
+        timing_summary_action = QAction("Timing Summary", self)
+        timing_summary_action.triggered.connect(self.show_timing_summary)
+        action_menu.addAction(timing_summary_action)
+
+        action_menu.addSeparator()
+
+        # 선택 사각형을 가까운 경계에 붙임 (Alt를 누르고 있으면 잠시 끔)
+        self.snap_action = QAction("Snap to Edges", self)
+        self.snap_action.setCheckable(True)
+        self.snap_action.setChecked(True)
+        self.snap_action.toggled.connect(self.toggle_snap)
+        action_menu.addAction(self.snap_action)
+
+        # 거의 같은 이미지가 이미 저장돼 있으면 저장하지 않음 (끄면 경고만)
+        self.skip_duplicates_action = QAction("Skip Duplicate Captures", self)
+        self.skip_duplicates_action.setCheckable(True)
+        action_menu.addAction(self.skip_duplicates_action)
+
+        # 폴더 감시 (새 스크린샷 자동 표시)
+        self.watch_action = QAction("Watch Folder...", self)
+        self.watch_action.setCheckable(True)
+        self.watch_action.toggled.connect(self.toggle_watch_folder)
+        action_menu.addAction(self.watch_action)
+
+        # 감시 중 새 파일마다 그려둔 사각형 영역을 잘라서 저장
+        self.watch_crop_action = QAction("Auto-crop Drawn Region", self)
+        self.watch_crop_action.setCheckable(True)
+        self.watch_crop_action.toggled.connect(self.toggle_watch_crop)
+        action_menu.addAction(self.watch_crop_action)
 
         # (요구사항 2) 툴바 설정
         self.toolbar = QToolBar("Toolbar")
@@ -263,6 +681,19 @@ class SophiaCapture(QMainWindow):
         self.image_capture_btn.clicked.connect(self.toggle_image_capture)
         self.image_capture_btn.setToolTip("Capture the region of image")
         self.toolbar.addWidget(self.image_capture_btn)
+
+        # Image Capture에서 선택한 영역을 모았다가 Export로 한 번에 저장
+        self.queue_btn = QPushButton("Queue")
+        self.queue_btn.setCheckable(True)
+        self.queue_btn.toggled.connect(self.toggle_queue_mode)
+        self.queue_btn.setToolTip("Queue selected regions and export them at once")
+        self.toolbar.addWidget(self.queue_btn)
+
+        self.export_btn = QPushButton("Export (0)")
+        self.export_btn.setToolTip("Save all queued regions")
+        self.export_btn.setEnabled(False)
+        self.export_btn.clicked.connect(self.export_queued_regions)
+        self.toolbar.addWidget(self.export_btn)
         # Mark 기능 버튼 추가
         self.mark_btn = QPushButton("Mark")
         self.mark_btn.setCheckable(True)
@@ -301,6 +732,15 @@ class SophiaCapture(QMainWindow):
         self.remove_btn.clicked.connect(self.remove_custom_region)
         self.toolbar.addWidget(self.remove_btn)        
 
+        # seperator
+        self.add_toolbar_separator()
+        # 🔹 이미지 캡쳐 후 매칭 검증 시 검색 영역 (FULL = 이미지 전체)
+        self.search_region_combo = QComboBox()
+        self.search_region_combo.addItem("FULL")
+        self.search_region_combo.addItems([region_name.name for region_name in RegionName])
+        self.search_region_combo.setToolTip("Search region for capture validation")
+        self.toolbar.addWidget(self.search_region_combo)
+
         # (요구사항 2) 중앙 레이아웃 설정
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -316,16 +756,37 @@ class SophiaCapture(QMainWindow):
         self.scroll_area.setWidget(self.image_label)
         self.scroll_area.setWidgetResizable(False)  #  QLabel 크기가 자동 변경되지 않도록 설정
 
-
-        # (요구사항 6, 7) 정보 표시 영역 (사용자 입력 가능)
-        self.info_text = QTextEdit()
-        self.info_text.setFixedWidth(600)  
-        self.info_text.setFont(QFont("Arial", 14))  
+        # 현재 이미지 폴더의 썸네일 줄 (보이는 칸만 백그라운드에서 디스크 캐시/디코딩으로 불러옴)
+        self.thumbnail_loader = ThumbnailLoader(ThumbnailCache(max_side=STRIP_THUMB_SIDE), parent=self)
+        self.thumbnail_model = ThumbnailStripModel(self.thumbnail_loader, self)
+        self.thumbnail_strip = ThumbnailStrip(self.thumbnail_model)
+        self.thumbnail_strip.file_activated.connect(self.request_open)
+        self.folder_files_changed.connect(self.on_folder_files_changed)
+
+        image_panel = QWidget()
+        image_layout = QVBoxLayout(image_panel)
+        image_layout.setContentsMargins(0, 0, 0, 0)
+        image_layout.addWidget(self.scroll_area)
+        image_layout.addWidget(self.thumbnail_strip)
+
+
+        # (요구사항 6, 7) 정보 표시 영역 (줄 단위 모델, 더블클릭으로 수정 가능)
+        self.info_log = InfoLogModel(self)
+        self.info_view = InfoLogView(self.info_log)
+        # 이미지별 작업 기록 (마크/region/info를 덧붙여 저장하고 다시 열 때 복원)
+        self.journal = None
+        self.journal_image = None  # journal이 기록 중인 이미지 경로
+        self.journal_cleared = set()  # 기록 재생이 끝나기 전에 사용자가 지운 것 ("marks", "region", "info")
+        self.journal_loader = JournalLoader()
+        self.info_log.entries_added.connect(self.record_info)
+        self.journal_loaded.connect(self.on_journal_loaded)
+        self.info_view.setFixedWidth(600)  
+        self.info_view.setFont(QFont("Arial", 14))  
 
         # (요구사항 2) 가변적인 7:3 비율 유지
         self.splitter = QSplitter(Qt.Horizontal)
-        self.splitter.addWidget(self.scroll_area)
-        self.splitter.addWidget(self.info_text)
+        self.splitter.addWidget(image_panel)
+        self.splitter.addWidget(self.info_view)
         self.splitter.setSizes([840, 600])  
 
         main_layout.addWidget(self.splitter)
@@ -335,6 +796,7 @@ class SophiaCapture(QMainWindow):
         self.setStatusBar(self.status_bar)
 
         self.mouse_pos_label = QLabel("X: 0, Y: 0 | Zoom: x1.0")
+        self.last_status_pos = (0, 0)
         self.mouse_pos_label.setAlignment(Qt.AlignCenter)
         self.status_label = QLabel("")
         self.message_label = QLabel("Ready")
@@ -342,12 +804,15 @@ class SophiaCapture(QMainWindow):
         self.status_bar.addWidget(self.mouse_pos_label, 2)
         self.status_bar.addWidget(self.status_label, 1)
         self.status_bar.addWidget(self.message_label, 3)
+        # 선택 영역 통계 (드래그 중 평균/표준편차, 놓은 뒤 닮은 곳 수/색 히스토그램)
+        self.region_label = QLabel("")
+        self.status_bar.addPermanentWidget(self.region_label)
 
         # 이미지 관련 변수
         self.image = None
-        self.pixmap = None
         self.rect_capture_mode = False
         self.image_capture_mode = False
+        self.queue_mode = False  # on : Image Capture 영역을 모았다가 Export로 한 번에 저장
         self.captured_images_count = 0
 
     def add_toolbar_separator(self):
@@ -364,6 +829,24 @@ class SophiaCapture(QMainWindow):
             self.showMaximized()
             self.is_first_show = False
 
+    def closeEvent(self, event):
+        """ 종료 시 백그라운드 작업 정리 (저장 대기 중인 이미지는 모두 저장) """
+        self.watch_timer.stop()
+        self.watch_executor.shutdown(wait=True, cancel_futures=True)  # 자동 잘라내기가 저장 큐에 넣는 것까지 기다림
+        self.capture_writer.shutdown()
+        self.info_log.flush()  # 남은 info 줄을 작업 기록에 반영
+        if self.journal is not None:
+            self.journal.close()
+        self.journal_loader.shutdown()
+        self.hash_index_loader.shutdown()
+        self.hash_index.close()
+        self.match_executor.shutdown(wait=False, cancel_futures=True)
+        self.analysis_executor.shutdown(wait=False, cancel_futures=True)
+        self.prefetcher.shutdown()
+        self.thumbnail_loader.shutdown()
+        self.folder_indexes.shutdown()
+        super().closeEvent(event)
+
     def toggle_rectangle_capture(self):
         """Rectangle Capture 모드 ON/OFF"""
         self.rect_capture_mode = not self.rect_capture_mode
@@ -402,7 +885,10 @@ class SophiaCapture(QMainWindow):
     def process_selection(self, rect):
         """ 선택된 영역을 원본 이미지 좌표로 변환 후 저장 """
         if self.original_image is None:
-            print("Error: original_image is None")  # 디버깅 추가
+            if self.preview_image is not None:
+                self.info_log.append("원본 이미지를 읽는 중입니다. 잠시 후 다시 선택하세요.")
+            else:
+                print("Error: original_image is None")  # 디버깅 추가
             return  
 
         # 화면 좌표 → 원본 좌표 변환
@@ -422,30 +908,276 @@ class SophiaCapture(QMainWindow):
             print("Error: Selection out of bounds")  # 선택 영역이 이미지 범위를 초과하는 경우
             return
 
-        if self.image_capture_mode:
-            save_path = get_save_path(self.save_folder, base_name= "image", ext="png") 
-            cropped = self.original_image[y:y+h, x:x+w]
+        self.score_region(x, y, w, h)
+
+        if self.image_capture_mode and self.queue_mode:
+            # 저장은 Export에서 한꺼번에
+            self.annotations.queue_region(x, y, w, h)
+            self.update_export_button()
+            self.image_label.update()
+
+        elif self.image_capture_mode:
+            cropped = self.original_image[y:y+h, x:x+w]  # view (원본은 수정하지 않으므로 복사 불필요)
             #  비어있는 이미지 방지
             if cropped is None or cropped.size == 0:
                 print("warning: 잘라낸 이미지가 비어있습니다.")
                 return
 
-            ext = ".png"
-            ret, buffer = cv2.imencode(ext, cropped)
-            if ret:
-                buffer.tofile(save_path)  #  한글 경로 지원
-                self.info_text.append(f"----->Region({x}, {y}, {w}, {h})")
-                self.info_text.append(f"{save_path} saved")
-                self.captured_images_count += 1
-            else:
-                print("warning: 이미지 인코딩 실패")
+            region = (x, y, w, h)
+            value, duplicate = self.find_duplicate(cropped)
+            if duplicate is not None:
+                distance, path = duplicate
+                if self.skip_duplicates_action.isChecked():
+                    self.info_log.append(f"skip: Region({x}, {y}, {w}, {h}) 거의 같은 캡처가 이미 있음 {path} (거리 {distance})")
+                    return
+                self.info_log.append(f"⚠ 거의 같은 캡처가 이미 있음 {path} (거리 {distance})")
+
+            # 인코딩/저장은 워커 스레드에서, 결과는 Signal로 받아서 info에 표시
+            save_path = get_save_path(self.save_folder, base_name= "image", ext="png")
+            if duplicate is None and value is not None:
+                self.hash_index.add(value, save_path)  # 중복은 넣지 않음 (먼저 저장된 캡처가 대표, 인덱스가 같은 해시로 불어나지 않음)
+
+            def saved(path, planned_path=save_path):
+                self.hash_index.saved(planned_path, path)  # 다른 프로세스와 이름이 겹쳤으면 path는 다음 번호
+                self.capture_saved.emit(path, region)
+            self.capture_writer.submit(cropped, save_path, on_done=saved, on_error=self.capture_failed.emit)
+            self.validate_capture(cropped, region)
 
 
         elif self.rect_capture_mode:
             # 화면 좌표 기준 (정확한 값 출력)
-            self.info_text.append("-----> ")
-            self.info_text.append(f"Rectangle({x}, {y}, {x+w}, {y + h})")  # 오른쪽/아래쪽 좌표를 포함하도록
-            self.info_text.append(f"Region({x}, {y}, {w}, {h})")  # 원본 이미지 기준
+            self.info_log.append("-----> ")
+            self.info_log.add(InfoKind.RECTANGLE, x, y, x + w, y + h)  # 오른쪽/아래쪽 좌표를 포함하도록
+            self.info_log.add(InfoKind.REGION, x, y, w, h)  # 원본 이미지 기준
+
+    def on_capture_saved(self, save_path, region):
+        """ 이미지 저장 완료 (UI 스레드) """
+        x, y, w, h = region
+        self.info_log.add(InfoKind.REGION, x, y, w, h, prefix="----->")
+        self.info_log.add(InfoKind.SAVED, save_path)
+        self.captured_images_count += 1
+
+    def toggle_queue_mode(self, checked):
+        """ Queue ON: Image Capture 선택 영역을 바로 저장하지 않고 모아 둠 """
+        self.queue_mode = checked
+        if checked and not self.image_capture_mode:
+            self.toggle_image_capture()
+
+    def update_export_button(self):
+        count = len(self.annotations.queued_regions)
+        self.export_btn.setText(f"Export ({count})")
+        self.export_btn.setEnabled(count > 0)
+
+    def remove_last_queued_region(self):
+        if self.annotations.unqueue_last() is not None:
+            self.update_export_button()
+            self.image_label.update()
+
+    def export_queued_regions(self):
+        """ 모아 둔 영역을 한꺼번에 저장 (원본 배열의 view를 코어 수만큼 병렬로 인코딩, 결과는 요약 한 줄) """
+        regions = self.annotations.queued_regions.tolist()
+        if not regions or self.original_image is None:
+            return
+        start = time.perf_counter()
+        image = self.original_image
+        save_folder = self.save_folder
+        skip = self.skip_duplicates_action.isChecked()
+        jobs = []
+        duplicates = 0
+        for x, y, w, h in regions:
+            cropped = image[y:y+h, x:x+w]
+            value, duplicate = self.find_duplicate(cropped)  # 같은 묶음 안의 중복도 찾도록 하나씩 추가
+            if duplicate is not None:
+                duplicates += 1
+                if skip:
+                    continue
+            save_path = get_save_path(save_folder, base_name="image", ext="png")
+            jobs.append((cropped, save_path))
+            if duplicate is None and value is not None:
+                self.hash_index.add(value, save_path)
+        note = f", 중복 {duplicates}개 {'건너뜀' if skip else '포함'}" if duplicates else ""
+        planned_paths = [save_path for _, save_path in jobs]
+
+        def finished(results):
+            for planned_path, (path, error, _) in zip(planned_paths, results):
+                if error is None:
+                    self.hash_index.saved(planned_path, path)
+                else:
+                    self.hash_index.discard(planned_path)
+            self.export_finished.emit(results, save_folder, start, note)
+        self.capture_writer.export_batch(jobs, finished)
+        self.annotations.clear_queued()
+        self.update_export_button()
+        self.image_label.update()
+
+    def on_export_finished(self, results, save_folder, start, note):
+        """ 한꺼번에 저장 완료 (UI 스레드) """
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        saved = [os.path.basename(path) for path, error, _ in results if error is None]
+        failed = [(path, error) for path, error, _ in results if error is not None]
+        nbytes = sum(n for _, _, n in results)
+        names = f"{saved[0]} ~ {saved[-1]}" if len(saved) > 1 else "".join(saved)
+        self.info_log.append(f"export: {len(saved)}/{len(results)} saved ({format_bytes(nbytes)}, {elapsed_ms:.0f}ms, "
+                             f"{self.capture_writer.batch_workers} threads{note}) {save_folder} {names}")
+        if failed:
+            path, error = failed[0]
+            self.info_log.add(InfoKind.ERROR, f"{len(failed)}개 저장 실패, 예: {path}: {error}")
+        self.captured_images_count += len(saved)
+
+    def find_duplicate(self, cropped):
+        """ 잘라낸 이미지의 dHash와 라이브러리에서 가장 가까운 캡처 ((거리, 경로) 또는 None)
+
+        평평한 영역은 밝기 차이가 없어 색/크기와 상관없이 해시가 0이 되므로 찾지도 넣지도 않음 (value None)
+        """
+        if is_flat(cropped):
+            return None, None
+        value = dhash(cropped)
+        return value, self.hash_index.find(value)
+
+    def build_edge_map(self):
+        """ 현재 이미지의 EdgeMap을 백그라운드에서 (결과는 on_edge_map_ready) """
+        self.edge_map = None
+        image = self.original_image
+        if image is None or not self.snap_action.isChecked() or self.low_memory_mode or isinstance(image, np.memmap):
+            return  # 누적표는 픽셀당 4바이트라 메모리 절약 모드/대용량 이미지에서는 붙이기 생략
+
+        def run():
+            try:
+                with span("edge_map", image.nbytes):
+                    edge_map = EdgeMap(image)
+            except Exception as e:
+                print(f"warning: 경계 계산 실패: {e}")
+                return
+            self.edge_map_ready.emit(image, edge_map)
+        self.analysis_executor.submit(run)
+
+    def on_edge_map_ready(self, image, edge_map):
+        if image is self.original_image:
+            self.edge_map = edge_map
+
+    def toggle_snap(self, checked):
+        if checked:
+            self.build_edge_map()
+        else:
+            self.edge_map = None
+
+    def build_region_stats(self):
+        """ 현재 이미지의 적분 영상을 백그라운드에서 (결과는 on_region_stats_ready) """
+        self.region_stats = None
+        self.scored_region = None
+        self.region_label.setText("")
+        image = self.original_image
+        if image is None or self.low_memory_mode or isinstance(image, np.memmap):
+            return  # 적분 영상은 픽셀당 12바이트라 메모리 절약 모드/대용량 이미지에서는 생략
+
+        def run():
+            try:
+                with span("integral", image.nbytes):
+                    stats = RegionStats(image)
+            except Exception as e:
+                print(f"warning: 적분 영상 계산 실패: {e}")
+                return
+            self.region_stats_ready.emit(image, stats)
+        self.analysis_executor.submit(run)
+
+    def on_region_stats_ready(self, image, stats):
+        if image is self.original_image:
+            self.region_stats = stats
+
+    def region_stats_text(self, x, y, w, h):
+        """ (영역 크기 + 밝기 평균/표준편차 문자열, 평평한 영역인지) (O(1), 적분 영상이 아직 없으면 크기만) """
+        text = f"{w}x{h}"
+        flat = False
+        mean_std = self.region_stats.mean_std(x, y, w, h) if self.region_stats is not None else None
+        if mean_std is not None:
+            mean, std = mean_std
+            flat = std < FLAT_STD
+            text += f" | mean {mean:.0f} std {std:.1f}" + (" ⚠ flat" if flat else "")
+        return text, flat
+
+    def display_region_stats(self, rect):
+        """ 드래그 중인 선택 영역의 통계를 상태바에 """
+        text, _ = self.region_stats_text(rect.x(), rect.y(), rect.width(), rect.height())
+        self.region_label.setText(text)
+
+    def score_region(self, x, y, w, h):
+        """ 선택 영역이 템플릿으로 쓸 만한지: 평균/표준편차는 바로, 닮은 곳 수/색 분포는 매칭 스레드에서 """
+        region = (x, y, w, h)
+        self.scored_region = region
+        text, flat = self.region_stats_text(x, y, w, h)
+        self.region_label.setText(text + " | scoring...")
+        cropped = self.original_image[y:y+h, x:x+w]
+        matcher = None
+        if not isinstance(self.original_image, np.memmap):
+            if self.matcher is None:
+                self.matcher = TemplateMatcher(self.original_image)
+            matcher = self.matcher
+
+        def run():
+            try:
+                colors = format_colors(color_histogram(cropped))
+                if matcher is None or flat:
+                    similar = ""  # 평평한 영역은 어디서나 점수가 불안정하므로 세지 않음
+                else:
+                    others = matcher.count_similar(cropped) - 1
+                    similar = f" | 닮은 곳 {others}" + (" ⚠" if others > 0 else "")
+            except Exception as e:
+                print(f"warning: 영역 점수 계산 실패: {e}")
+                return
+            self.region_scored.emit(region, f"{text}{similar} | {colors}")
+        self.match_executor.submit(run)
+
+    def on_region_scored(self, region, text):
+        if region == self.scored_region:
+            self.region_label.setText(text)
+
+    def snap_edge_map(self):
+        """ 선택 사각형을 붙일 EdgeMap (꺼져 있거나, 아직 계산 중이거나, Alt를 누르고 있으면 None) """
+        if self.edge_map is None or QApplication.keyboardModifiers() & Qt.AltModifier:
+            return None
+        return self.edge_map
+
+    def on_capture_failed(self, save_path, message):
+        """ 이미지 저장 실패 (UI 스레드) """
+        self.hash_index.discard(save_path)
+        print(f"warning: {save_path} 저장 실패: {message}")
+        self.info_log.add(InfoKind.ERROR, f"{save_path} 저장 실패: {message}")
+
+    def validate_capture(self, cropped, region):
+        """ 잘라낸 이미지를 원본에서 다시 찾아보기 (매칭 스레드, 결과는 on_match_finished) """
+        if isinstance(self.original_image, np.memmap):
+            return  # 대용량 이미지는 흑백 피라미드 전체를 메모리에 만들어야 하므로 검증 생략
+        if self.matcher is None:
+            self.matcher = TemplateMatcher(self.original_image)
+        matcher = self.matcher
+
+        search_region = None
+        region_name = self.search_region_combo.currentText()
+        if region_name != "FULL":
+            h_img, w_img = self.original_image.shape[:2]
+            search_region = get_region(RegionName[region_name], (0, 0, w_img, h_img))
+
+        def run():
+            try:
+                result = matcher.match(cropped, search_region)
+            except Exception as e:
+                print(f"warning: 매칭 실패: {e}")
+                result = None
+            self.match_finished.emit(region, result)
+        self.match_executor.submit(run)
+
+    def on_match_finished(self, region, result):
+        """ 매칭 검증 결과를 info에 표시 (UI 스레드) """
+        x, y, w, h = region
+        if result is None:
+            self.info_log.append(f"match: Region({x}, {y}, {w}, {h}) 검색 영역에서 찾을 수 없음")
+            return
+        second = f"{result.second_score:.3f}" if result.second_score is not None else "-"
+        self.info_log.append(f"match: ({result.x}, {result.y}) score={result.score:.3f}, 2nd={second}, {result.elapsed_ms:.1f}ms")
+        if (result.x, result.y) != (x, y):
+            self.info_log.append("⚠ 잘라낸 위치가 아닌 다른 곳이 먼저 찾아짐")
+        elif result.second_score is not None and result.uniqueness < 0.1:
+            self.info_log.append("⚠ 비슷한 곳이 여러 군데 있음 (유일하지 않은 이미지)")
 
     def open_image(self):
         home_path = os.path.expanduser("~")
@@ -460,29 +1192,43 @@ class SophiaCapture(QMainWindow):
 
         self.open_process(file_path)    
 
-    def open_process(self, file_path, change_save_folder=True):
+    def open_process(self, file_path, change_save_folder=True, image=None):
+        """ 이미지 열기 (image를 주면 디코딩 생략, 디코딩 캐시에 없으면 미리보기 표시 후 백그라운드 디코딩) """
         if not file_path or not os.path.exists(file_path):
             print("Error: File does not exist.")
             return
 
-        self.loaded_file_path = file_path  
-        image_array = np.fromfile(file_path, dtype=np.uint8)
-        self.original_image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-
-        if self.original_image is None:
-            print(f"Error: Failed to load image {file_path}")
+        if image is None:
+            image = self.prefetcher.get(file_path)
+        if image is None:
+            self.request_open(file_path, change_save_folder)  # 완료되면 image를 가지고 다시 호출됨
             return
 
-        print(f"Image loaded: {file_path}, Size: {self.original_image.shape[1]}x{self.original_image.shape[0]}")
-        self.displayed_image = self.original_image.copy()
-        self.scale_factor = 1.0
+        start = time.perf_counter()
+        # 이전 이미지에서 잘라낸 것들은 저장 경로(절대 경로)가 이미 정해졌으므로 기다리지 않음
+        self.switch_journal(file_path)
+
+        keep_scale = self.preview_image is not None  # 미리보기에서 바꾼 배율/스크롤 위치 유지
+        self.loaded_file_path = file_path  
+        self.original_image = image
+        self.preview_image = None
+        self.preview_size = None
+        self.matcher = None
+        self.image_label.set_image_bounds(image.shape[1], image.shape[0])
+        self.build_edge_map()
+        self.build_region_stats()
+
+        levels = (lambda k: self.mapped_images.level(image, k)) if isinstance(image, np.memmap) else None
+        self.zoom_cache = ZoomCache(self.original_image, self.zoom_cache_bytes, levels)  # 이전 이미지의 캐시는 버림
+        if not keep_scale:
+            self.scale_factor = 1.0
         self.display_image()
+        timing.record("open", start, time.perf_counter(), path=file_path, size=f"{image.shape[1]}x{image.shape[0]}")
 
         self.setWindowTitle(f"Sophia Capture v{self.VERSION} - {file_path}")
 
         if change_save_folder:
-            home_path = os.path.expanduser("~")
-            default_folder = os.path.join(home_path, "Pictures", "SophiaCapture")
+            default_folder = self.capture_root()
 
             image_basename = os.path.basename(file_path)
             image_name, _ = os.path.splitext(image_basename)
@@ -492,143 +1238,92 @@ class SophiaCapture(QMainWindow):
         self.captured_images_count = 0
         self.message_label.setText(self.save_folder)
 
+        # 폴더 인덱스 준비 (변경 감시) 후 탐색 순서상 앞/뒤 이미지를 미리 디코딩
+        folder = os.path.dirname(file_path)
+        if folder not in self.dir_watcher.directories():
+            self.dir_watcher.addPath(folder)
+        self.folder_indexes.run_after_ready(folder, lambda index: self.prefetch_around(index, file_path))
+        if same_folder(self.thumbnail_model.folder, folder):
+            self.thumbnail_strip.set_current(file_path)
+        else:
+            self.folder_indexes.run_after_ready(folder, lambda index: self.folder_files_changed.emit(folder, index.files))
+
 
     def show_image_regions(self):
-        """ Info 버튼 클릭 시 info_text에 Region 정보 출력 """
+        """ Info 버튼 클릭 시 info에 Region 정보 출력 """
         if self.original_image is None:
-            self.info_text.append(" 이미지가 로드되지 않았습니다.")
+            self.info_log.append(" 이미지가 로드되지 않았습니다.")
             return
 
         h, w, _ = self.original_image.shape
         base_region = (0, 0, w, h)
-        self.info_text.append("-----> Image Region Info")
-        self.info_text.append(f"loaded image path: : {self.loaded_file_path}")
-        self.info_text.append(f"base_region = Region(0, 0, {w}, {h})")
+        self.info_log.append("-----> Image Region Info")
+        self.info_log.append(f"loaded image path: : {self.loaded_file_path}")
+        self.info_log.append(f"base_region = Region(0, 0, {w}, {h})")
 
         for region_name in RegionName:
             region = get_region(region_name, base_region)
-            self.info_text.append(f"{region_name.name}_REGION = Region{region}")
+            self.info_log.append(f"{region_name.name}_REGION = Region{region}")
 
     def reset_zoom(self):
         """ 이미지 원래 크기로 복원 """
-        if self.original_image is None:
+        if self.tile_renderer is None:
             return
         self.scale_factor = 1.0
         self.display_image()
-        self.update_marks()
 
     def zoom_in(self):
         """ 이미지 확대 (QLabel 크기 업데이트 포함) """
-        if self.original_image is None:
-            print("Error: zoom_in() called but original_image is None")
+        if self.tile_renderer is None:
+            print("Error: zoom_in() called but no image is displayed")
             return
 
-        self.scale_factor *= 1.2
-        print(f"Zoom In: New Scale Factor = {self.scale_factor}")
-
+        self.scale_factor *= ZOOM_STEP
         self.display_image()
-        self.update_marks()
-
-        #  QPixmap이 존재할 때만 QLabel 크기 조정
-        if not self.pixmap.isNull():
-            new_size = self.pixmap.size()
-            self.image_label.resize(new_size)
-            print(f"Zoom In: QLabel New Size = {new_size.width()}x{new_size.height()}")
-
-        self.scroll_area.setWidgetResizable(False)
-        self.scroll_area.update()
 
     def zoom_out(self):
         """ 이미지 축소 (QLabel 크기 업데이트 포함) """
-        if self.original_image is None:
-            print("Error: zoom_out() called but original_image is None")
+        if self.tile_renderer is None:
+            print("Error: zoom_out() called but no image is displayed")
             return
 
-        self.scale_factor /= 1.2
-        print(f"Zoom Out: New Scale Factor = {self.scale_factor}")
-
+        self.scale_factor /= ZOOM_STEP
         self.display_image()
-        self.update_marks()
-
-        #  QPixmap이 존재할 때만 QLabel 크기 조정
-        if not self.pixmap.isNull():
-            new_size = self.pixmap.size()
-            self.image_label.resize(new_size)
-            print(f"Zoom Out: QLabel New Size = {new_size.width()}x{new_size.height()}")
-
-        self.scroll_area.setWidgetResizable(False)
-        self.scroll_area.update()
-
-    def update_marks(self):
-        """ 기존 마크 좌표를 현재 scale_factor에 맞게 변환 """
-        for mark, image_x, image_y in self.mark_list:
-            scaled_x, scaled_y = PosUtil.image_to_disp_pos(image_x, image_y, self.scale_factor)
-            mark.move(scaled_x, scaled_y)
 
     def display_image(self):
-        """ 확대/축소 적용하여 이미지 표시 (QPixmap 변환 오류 및 품질 완전 개선) """
-        if self.original_image is None:
+        """ 확대/축소 적용하여 이미지 표시 (보이는 영역의 타일만 리샘플링) """
+        if self.original_image is None and self.preview_image is None:
             print("Error: display_image() called but original_image is None")
             return
 
-        h, w, ch = self.original_image.shape
-        new_w = int(w * self.scale_factor)
-        new_h = int(h * self.scale_factor)
-
-        if new_w < 1:
-            new_w = 1
-        if new_h < 1:
-            new_h = 1
-
-        print(f"Resizing Image to: {new_w}x{new_h}")
-
-        if self.scale_factor == 1.0:
-            # 1:1 비율이면 원본 그대로 사용
-            display_img = self.original_image
+        # 전체 이미지를 resize하지 않고, 타일 렌더러만 새 배율로 교체
+        # 배율을 양자화해서 같은 배율로 돌아오면 캐시된 타일을 그대로 사용
+        self.scale_factor = quantize_scale(self.scale_factor)
+        if self.original_image is not None:
+            source = self.zoom_cache.level_for(self.scale_factor)
+            self.tile_renderer = TileRenderer(self.original_image, self.scale_factor, source=source)
         else:
-            # 확대/축소할 때만 resize
-            display_img = cv2.resize(self.original_image, (new_w, new_h), interpolation=cv2.INTER_LANCZOS4)
-
-        self.displayed_image = display_img
-
-        # BGR -> RGB 명시적 변환
-        rgb_image = cv2.cvtColor(display_img, cv2.COLOR_BGR2RGB)
-
-        # QImage 생성 후 .copy() 호출로 메모리 완전 복사
-        qt_image = QImage(rgb_image.data, rgb_image.shape[1], rgb_image.shape[0], rgb_image.strides[0], QImage.Format_RGB888).copy()
-
-        # QPixmap 생성
-        self.pixmap = QPixmap.fromImage(qt_image)
-
-        if self.pixmap.isNull():
-            print("Error: QPixmap conversion failed!")
-            return
+            # 미리보기: 표시 크기는 원본 기준 그대로, 픽셀만 미리보기에서 리샘플링 (좌표 변환이 바뀌지 않음)
+            preview_ratio = self.preview_size[0] / self.preview_image.shape[1]
+            source = self.zoom_cache.level_for(self.scale_factor * preview_ratio)
+            self.tile_renderer = TileRenderer(None, self.scale_factor, source=source, size=self.preview_size)
 
-        print(f"Pixmap Created: {self.pixmap.width()}x{self.pixmap.height()}")
-
-        # 화면 스케일 비율 감지
-        scale_factor = self.devicePixelRatioF()
-
-        # Pixmap에 스케일 적용
-        self.pixmap.setDevicePixelRatio(scale_factor)
-
-        self.image_label.setPixmap(self.pixmap)
-        self.image_label.setScaledContents(False)
-        self.image_label.resize(self.pixmap.size() / scale_factor)        
-
-        #  QLabel 크기를 Pixmap 크기로 설정
-        self.image_label.resize(self.pixmap.size())
-        print(f"QLabel New Size: {self.image_label.width()}x{self.image_label.height()}")
+        #  QLabel 크기를 표시 이미지 크기로 설정 (타일은 paintEvent에서 필요한 것만 그림)
+        self.image_label.resize(self.tile_renderer.width, self.tile_renderer.height)
+        self.image_label.reset_tiles()
 
         #  QScrollArea 업데이트
         self.scroll_area.setWidgetResizable(False)
         self.scroll_area.update()
 
-
-
-    def display_status_message(self, x, y):
-        """ (요구사항 1) 마우스 좌표 + Zoom Factor 업데이트 """
-        self.mouse_pos_label.setText(f"X: {x}, Y: {y} | Zoom: x{self.scale_factor:.1f}")
+    def display_status_message(self, x=None, y=None):
+        """ (요구사항 1) 마우스 좌표 + Zoom Factor 업데이트 (좌표 생략 시 마지막 좌표) """
+        if x is None or y is None:
+            x, y = self.last_status_pos
+        self.last_status_pos = (x, y)
+        text = f"X: {x}, Y: {y} | Zoom: x{self.scale_factor:.1f}"
+        if text != self.mouse_pos_label.text():  # 같은 내용이면 다시 그리지 않음
+            self.mouse_pos_label.setText(text)
 
 
     def show_about_popup(self):
@@ -645,9 +1340,9 @@ class SophiaCapture(QMainWindow):
 #---------------------------------마크 기능 추가---------------------------------
     def clear_marks(self):
         """ 화면에 표시된 + 마크를 모두 삭제 """
-        for mark, _, _ in self.mark_list:  # 🔹 튜플에서 QLabel(mark)만 가져오기
-            mark.deleteLater()  # QLabel 제거
-        self.mark_list.clear()  # 리스트 초기화
+        self.annotations.clear_marks()
+        self.record("marks_clear")
+        self.image_label.update()
 
     def toggle_cross_cursor(self):
         """ Cross-Cursor 모드 ON/OFF """
@@ -659,7 +1354,7 @@ class SophiaCapture(QMainWindow):
             cursor_pos = self.image_label.mapFromGlobal(QCursor.pos())  
             x = cursor_pos.x()
             y = cursor_pos.y()            
-            self.image_label.update_mark_positions()  # 🔹 다시 그리기
+            self.image_label.update()  # 🔹 다시 그리기
             self.display_status_message()
         else:
             print(" Cross Cursor OFF: Removing lines")  
@@ -701,9 +1396,8 @@ class SophiaCapture(QMainWindow):
 
     #------------------------------------------------------------------
     def save_info_to_file(self):
-        """ info_text 내용을 파일로 저장 """
-        text = self.info_text.toPlainText()
-        if not text.strip():
+        """ info 내용을 파일로 저장 (모델에서 한 줄씩 기록) """
+        if not any(line.strip() for line in self.info_log.lines()):
             QMessageBox.information(self, "Info", "저장할 내용이 없습니다.")
             return
 
@@ -711,27 +1405,28 @@ class SophiaCapture(QMainWindow):
         if file_path:
             try:
                 with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(text)
+                    self.info_log.write_to(f)
                 QMessageBox.information(self, "Saved", f"{file_path} 저장 완료")
             except Exception as e:
                 QMessageBox.critical(self, "오류", f"파일 저장 실패: {e}")
 
     def copy_info_to_clipboard(self):
-        """ info_text 내용을 클립보드로 복사 """
+        """ info 내용을 클립보드로 복사 """
         clipboard = QApplication.clipboard()
-        clipboard.setText(self.info_text.toPlainText())
+        clipboard.setText("\n".join(self.info_log.lines()))
         QMessageBox.information(self, "Copied", "클립보드에 복사되었습니다.")
 
     def clear_info_text(self):
-        """ info_text 내용 지우기 """
-        self.info_text.clear()
+        """ info 내용 지우기 """
+        self.info_log.clear()
+        self.record("info_clear")
 
     def set_save_folder_dialog(self):
         """ 폴더 선택 다이얼로그를 띄우고, 선택된 폴더를 저장 폴더로 설정 """
         folder = QFileDialog.getExistingDirectory(self, "Select Save Folder", self.save_folder or "")
         if folder:
             self.save_folder = folder
-            self.info_text.append(f"Save folder set to: {self.save_folder}")
+            self.info_log.append(f"Save folder set to: {self.save_folder}")
             self.message_label.setText(self.save_folder)
 
     def explore_folder_action(self):
@@ -744,6 +1439,41 @@ class SophiaCapture(QMainWindow):
             return
         os.startfile(self.save_folder)  # Windows에서 폴더 열기
 
+    def set_low_memory_mode(self, enabled):
+        """ 메모리 절약 모드: 확대/축소 캐시 축소, 이웃 이미지 미리 디코딩 중지 """
+        self.low_memory_mode = enabled
+        if enabled:
+            self.zoom_cache_bytes = LOW_MEMORY_ZOOM_CACHE_BYTES
+            self.prefetcher.set_budget(0, 0)  # 디코딩 캐시는 마지막 1장만 유지
+        else:
+            self.zoom_cache_bytes = DEFAULT_ZOOM_CACHE_BYTES
+            self.prefetcher.set_budget(DEFAULT_DECODE_CACHE_BYTES, DEFAULT_PREFETCH_COUNT)
+        if self.zoom_cache is not None:
+            self.zoom_cache.cache.set_max_bytes(self.zoom_cache_bytes)
+        self.build_edge_map()  # 켜면 경계 누적표와 적분 영상을 버리고, 끄면 다시 계산
+        self.build_region_stats()
+        self.info_log.append(f"Low memory mode: {'ON' if enabled else 'OFF'}")
+
+    def show_timing_summary(self):
+        """ 구간 시간 측정 요약 창 """
+        TimingDialog(self).exec()
+
+    def show_memory_info(self):
+        """ 이미지/캐시/프로세스 메모리 사용량을 info에 출력 """
+        def fmt(nbytes):
+            return format_bytes(nbytes) if nbytes is not None else "N/A"
+
+        self.info_log.append("-----> Memory Info")
+        if self.original_image is not None:
+            mapped = " (memory-mapped, on disk)" if isinstance(self.original_image, np.memmap) else ""
+            self.info_log.append(f"original image: {fmt(self.original_image.nbytes)}{mapped}")
+        if self.preview_image is not None:
+            self.info_log.append(f"preview image: {fmt(self.preview_image.nbytes)}")
+        if self.zoom_cache is not None:
+            self.info_log.append(f"zoom cache: {fmt(self.zoom_cache.cache.total_bytes)} / {fmt(self.zoom_cache.cache.max_bytes)}")
+        self.info_log.append(f"decode cache: {fmt(self.prefetcher.cache.total_bytes)} ({len(self.prefetcher.cache)} images)")
+        self.info_log.append(f"process memory: {fmt(current_rss_bytes())}, peak: {fmt(peak_rss_bytes())}")
+
 #--------------------------------------------------------------------
     def load_prev_image(self):
         self.load_adjacent_image(-1)
@@ -755,26 +1485,314 @@ class SophiaCapture(QMainWindow):
         if not hasattr(self, "loaded_file_path") or not os.path.exists(self.loaded_file_path):
             return  # 이미지가 로드되지 않았으면 아무것도 하지 않음
 
-        folder = os.path.dirname(self.loaded_file_path)
-        files = [f for f in os.listdir(folder) if f.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp'))]
-        if not files:
-            return
+        # 인덱스 워커가 위치를 찾는 동안 들어온 클릭은 모아서 한 번에 이동
+        self.navigation_steps += direction
+        if not self.navigation_in_flight:
+            self.run_navigation()
 
-        full_paths = [os.path.join(folder, f) for f in files]
-        sorted_files = sorted(full_paths, key=lambda f: os.path.getmtime(f))
-
-        # 파일 이름 기준으로 현재 이미지 위치 찾기
-        current_file_name = os.path.basename(self.loaded_file_path)
-        current_index = next(
-            (i for i, path in enumerate(sorted_files) if os.path.basename(path) == current_file_name),
-            -1
-        )
-        if current_index == -1:
+    def run_navigation(self):
+        """ 모아 둔 이동 수만큼 떨어진 이미지를 인덱스 워커에서 찾는다 (UI 스레드는 폴더를 읽지 않음) """
+        steps, self.navigation_steps = self.navigation_steps, 0
+        if steps == 0:
+            return
+        # 디코딩을 기다리는 이미지가 있으면 그 이미지를 기준으로 이동 (연속 클릭)
+        current_path = self.pending_open_path or self.loaded_file_path
+        self.navigation_in_flight = True
+
+        def navigate(index):
+            # 수정시각 순 인덱스에서 현재 위치 찾기 (O(1)), 인덱스에 아직 없으면 한 번 갱신
+            if index.position(current_path) is None:
+                index.refresh()
+            # 🔁 순환 처리
+            self.navigation_ready.emit(index.neighbor(current_path, steps) or "")
+        self.folder_indexes.run_after_ready(os.path.dirname(current_path), navigate)
+
+    def on_navigation_ready(self, new_path):
+        self.navigation_in_flight = False
+        if new_path:
+            self.request_open(new_path)
+        self.run_navigation()
+
+    def prefetch_around(self, index, file_path):
+        """ (인덱스 워커 스레드) file_path의 앞/뒤 이미지를 디코딩 요청 """
+        position = index.position(file_path)
+        if position is not None:
+            self.prefetcher.prefetch_neighbors(index.files, position)
+
+    def on_directory_changed(self, folder):
+        """ 폴더 변경 알림은 잠깐 모았다가 한 번에 인덱스 갱신 """
+        self.changed_folders.add(folder)
+        self.dir_refresh_timer.start(200)
+
+    def refresh_changed_folders(self):
+        for folder in self.changed_folders:
+            self.folder_indexes.refresh(folder, self.on_index_refreshed)
+        self.changed_folders.clear()
+
+    def on_index_refreshed(self, index, changed):
+        """ (인덱스 워커 스레드) 바뀐 파일 목록을 UI 스레드로 """
+        if not changed:
+            return
+        self.folder_files_changed.emit(index.folder, index.files)
+        if self.is_watch_folder(index.folder) and index.last_added:
+            self.watch_files_added.emit(index.last_added)
+
+    def on_folder_files_changed(self, folder, files):
+        """ 현재 이미지 폴더의 목록이면 썸네일 줄 갱신 """
+        current = self.pending_open_path or getattr(self, "loaded_file_path", None)
+        if current is None or not same_folder(os.path.dirname(current), folder):
+            return
+        self.thumbnail_model.set_files(folder, files)
+        self.thumbnail_strip.set_current(current)
+
+    #---------------------------------------------------------------
+    # 폴더 감시
+    #---------------------------------------------------------------
+    def is_watch_folder(self, folder):
+        return self.watch_folder is not None and os.path.normcase(os.path.abspath(folder)) == self.watch_folder
+
+    def toggle_watch_folder(self, checked):
+        """ Watch Folder 메뉴: 켤 때 감시할 폴더 선택 """
+        if not checked:
+            self.stop_watch_folder()
+            return
+        current = getattr(self, "loaded_file_path", None)
+        start_folder = os.path.dirname(current) if current else os.path.expanduser("~")
+        folder = QFileDialog.getExistingDirectory(self, "Watch Folder", start_folder)
+        if not folder:
+            self.watch_action.setChecked(False)
+            return
+        self.start_watch_folder(folder)
+
+    def start_watch_folder(self, folder):
+        """ folder에 새로 생기는 이미지를 받아들이기 시작 (이미 있던 파일은 대상 아님) """
+        self.stop_watch_folder()
+        self.watch_folder = os.path.normcase(os.path.abspath(folder))
+        self.watch_received = 0
+        self.watch_cropped_count = 0
+        self.folder_indexes.index(folder)  # 지금 있는 파일로 인덱스 구성 (이후 refresh에서 새 파일만 골라냄)
+        if folder not in self.dir_watcher.directories():
+            self.dir_watcher.addPath(folder)
+        self.info_log.append(f"watch: {folder} 감시 시작")
+
+    def stop_watch_folder(self):
+        if self.watch_folder is None:
+            return
+        self.info_log.append(f"watch: 감시 종료 (받음 {self.watch_received}, 잘라냄 {self.watch_cropped_count})")
+        self.watch_folder = None
+        self.watch_tracker.clear()
+        self.watch_timer.stop()
+
+    def toggle_watch_crop(self, checked):
+        """ 켜는 순간 그려져 있는 사각형을 자동 잘라내기 영역으로 고정 (이미지가 바뀌어도 유지) """
+        if not checked:
+            self.watch_crop_region = None
+            return
+        if not self.last_drawn_region:
+            QMessageBox.warning(self, "경고", "먼저 x,y,w,h로 사각형을 그리세요.")
+            self.watch_crop_action.setChecked(False)
             return
+        self.watch_crop_region = self.last_drawn_region
+        self.info_log.append("watch: 새 이미지마다 Region({}, {}, {}, {}) 자동 잘라내기".format(*self.watch_crop_region))
 
-        # 🔁 순환 처리
-        new_index = (current_index + direction) % len(sorted_files)        
-        self.open_process(sorted_files[new_index], change_save_folder=False)  # 저장 폴더 변경 안 함
+    def on_watch_files_added(self, paths):
+        """ 감시 폴더에 생긴 파일은 다 써질 때까지 기다린 뒤 처리 """
+        if self.watch_folder is None:
+            return
+        self.watch_tracker.add(path for path in paths if self.is_watch_folder(os.path.dirname(path)))
+        if len(self.watch_tracker) and not self.watch_timer.isActive():
+            self.watch_timer.start(STABLE_CHECK_MS)
+
+    def poll_watch_folder(self):
+        """ 다 써진 파일: 모두 자동 잘라내기, 화면에는 가장 최신 것만 (한꺼번에 수백 개가 생겨도 디코딩 1번) """
+        ready = self.watch_tracker.poll()
+        if not len(self.watch_tracker):
+            self.watch_timer.stop()
+        if not ready:
+            return
+        self.watch_received += len(ready)
+        newest = ready[-1]
+        if newest != getattr(self, "loaded_file_path", None):
+            self.request_open(newest, change_save_folder=True)  # 앞에서 열던 이미지는 on_image_decoded에서 무시됨
+        region = self.watch_crop_region
+        if region is not None:
+            # 가장 최신 파일과 그 이웃은 어차피 화면 표시/미리 디코딩으로 디코딩하므로 그 결과를 같이 씀 (디코딩 중이면 그 작업에 붙음)
+            shared = {newest}
+            index = self.folder_indexes.index(os.path.dirname(newest))
+            position = index.position(newest)
+            if position is not None:
+                shared.update(self.prefetcher.neighbors(index.files, position))
+            for path in ready:
+                if path in shared:
+                    self.prefetcher.request(path, lambda path, image: self.watch_executor.submit(self.crop_decoded, path, image, region))
+                else:
+                    self.watch_executor.submit(self.auto_crop, path, region)
+        self.display_watch_status()
+
+    def auto_crop(self, file_path, region):
+        """ 워커 스레드: file_path를 디코딩해서 region을 잘라 그 이미지의 저장 폴더에 저장 """
+        image = self.prefetcher.get(file_path)
+        if image is None:
+            with span("decode", path=file_path):
+                image = decode_image(file_path)
+        self.crop_decoded(file_path, image, region)
+
+    def crop_decoded(self, file_path, image, region):
+        """ 워커 스레드: 디코딩한 image(실패 시 None)에서 region을 잘라 그 이미지의 저장 폴더에 저장 """
+        if image is None:
+            self.capture_failed.emit(file_path, "이미지 디코딩 실패")
+            return
+        x, y, w, h = region
+        if x + w > image.shape[1] or y + h > image.shape[0]:
+            self.capture_failed.emit(file_path, f"Region({x}, {y}, {w}, {h})이 이미지 범위를 벗어남")
+            return
+        image_name, _ = os.path.splitext(os.path.basename(file_path))
+        save_folder = os.path.join(self.capture_root(), image_name)
+        os.makedirs(save_folder, exist_ok=True)
+        save_path = get_save_path(save_folder, base_name="image", ext="png")
+        # 원본 전체가 저장 큐에 남지 않도록 잘라낸 부분만 복사, 큐가 가득 차면 여기서 기다림 (UI는 막지 않음)
+        self.capture_writer.submit(image[y:y+h, x:x+w].copy(), save_path,
+                                   on_done=self.watch_cropped.emit, on_error=self.capture_failed.emit)
+
+    def on_watch_cropped(self, save_path):
+        self.watch_cropped_count += 1
+        self.display_watch_status()
+
+    def display_watch_status(self):
+        pending = len(self.watch_tracker)
+        text = f"watch: 받음 {self.watch_received}, 잘라냄 {self.watch_cropped_count}"
+        if pending:
+            text += f", 쓰는 중 {pending}"
+        self.status_label.setText(text)
+
+    def request_open(self, file_path, change_save_folder=False):
+        """ 디코딩은 워커에 맡기고, 끝나면 on_image_decoded에서 화면에 표시 (UI 스레드 블로킹 없음)
+
+        큰 이미지는 그동안 미리보기(JPEG 축소 디코딩 또는 디스크 썸네일)를 먼저 보여준다.
+        """
+        self.pending_open_path = file_path
+        self.pending_change_save_folder = change_save_folder
+        image = self.prefetcher.get(file_path)
+        if image is not None:
+            self.on_image_decoded(file_path, image)
+            return
+        self.message_label.setText(f"Loading {os.path.basename(file_path)}...")
+
+        with span("read_header"):
+            size = read_image_size(file_path)
+        large = is_large_image(size)
+        if large:
+            image = self.mapped_images.open(file_path, size)
+            if image is not None:
+                self.on_image_decoded(file_path, image)  # 전에 디스크로 옮겨 둔 이미지, 디코딩 불필요
+                return
+        with span("preview_decode", path=file_path):
+            preview = load_preview(file_path, size, self.thumbnails)
+        if preview is not None:
+            self.show_preview(file_path, preview, size)
+
+        def decoded(path, image):
+            # 워커 스레드: 화면 교체를 먼저 요청하고, 다음에 열 때 쓸 썸네일은 그 뒤에 저장
+            decoded_image = image
+            if image is not None and large:
+                # 대용량: 디스크로 옮기고 메모리의 배열(디코딩 캐시 포함)은 버림
+                try:
+                    mapped = self.mapped_images.create(path, image)
+                    if mapped is not None:
+                        image = mapped
+                        self.prefetcher.discard(path)
+                except OSError as e:
+                    print(f"warning: 대용량 이미지 디스크 캐시 실패, 메모리에서 표시: {e}")
+            self.image_decoded.emit(path, image)
+            if decoded_image is not None and needs_preview(size) and not has_reduced_decode(path):
+                self.thumbnails.put(path, decoded_image)
+        self.prefetcher.request(file_path, decoded)
+
+    def show_preview(self, file_path, preview, size):
+        """ 원본 디코딩이 끝날 때까지 미리보기 표시 (좌표는 원본 기준, 잘라내기는 막음) """
+        self.switch_journal(file_path)  # 미리보기에서 찍은 마크도 새 이미지에 기록
+        self.original_image = None
+        self.matcher = None
+        self.edge_map = None
+        self.region_stats = None
+        self.preview_image = preview
+        self.preview_size = size
+        self.image_label.set_image_bounds(*size)
+        self.zoom_cache = ZoomCache(preview, self.zoom_cache_bytes)
+        self.scale_factor = 1.0
+        self.display_image()
+        self.setWindowTitle(f"Sophia Capture v{self.VERSION} - {file_path} (loading...)")
+
+    def on_image_decoded(self, file_path, image):
+        """ 백그라운드 디코딩 완료 (UI 스레드) """
+        if file_path != self.pending_open_path:
+            return  # 그 사이에 다른 이미지로 이동함 (결과는 캐시에 남음)
+        self.pending_open_path = None
+        if image is None:
+            print(f"Error: Failed to load image {file_path}")
+            if self.preview_image is not None:
+                # 미리보기만 남지 않도록 화면 비움
+                self.preview_image = None
+                self.tile_renderer = None
+                self.image_label.update()
+            self.message_label.setText(f"이미지를 열 수 없음: {os.path.basename(file_path)}")
+            self.info_log.add(InfoKind.ERROR, f"이미지를 열 수 없음: {file_path}")
+            return
+        # 저장 폴더는 처음 open_process를 부를 때 요청한 대로 (이전/다음 이동은 변경 안 함)
+        self.open_process(file_path, change_save_folder=self.pending_change_save_folder, image=image)
+
+    def capture_root(self):
+        """ 이미지별 저장 폴더와 작업 기록이 놓이는 폴더 (~/Pictures/SophiaCapture) """
+        return os.path.join(os.path.expanduser("~"), "Pictures", "SophiaCapture")
+
+    #---------------------------------------------------------------
+    # 이미지별 작업 기록
+    #---------------------------------------------------------------
+    def record(self, op, **fields):
+        """ 현재 이미지의 작업 기록에 한 줄 추가 """
+        if op.endswith("_clear"):
+            self.journal_cleared.add(op[:-len("_clear")])
+        if self.journal is not None:
+            self.journal.append(op, **fields)
+
+    def record_info(self, entries):
+        """ 새로 추가된 info 줄을 작업 기록에 (한 번에 추가된 줄은 한 번에 씀) """
+        if self.journal is not None:
+            self.journal.write([{"op": "info", "kind": entry.kind.name, "values": list(entry.values), "prefix": entry.prefix}
+                                for entry in entries])
+
+    def switch_journal(self, file_path):
+        """ 다른 이미지로 바뀔 때: 화면의 마크/region/info를 비우고 그 이미지의 기록을 백그라운드에서 재생 """
+        if file_path == self.journal_image:
+            return
+        self.info_log.flush()  # 이전 이미지의 info 줄은 이전 기록에
+        if self.journal is not None:
+            self.journal.close()
+        if len(self.annotations.queued_regions):
+            self.export_queued_regions()  # 모아 둔 영역은 이전 이미지/저장 폴더로 저장하고 넘어감
+        self.annotations.clear_marks()
+        self.annotations.clear_regions()
+        self.last_drawn_region = None
+        self.info_log.clear()
+
+        self.journal_image = file_path
+        self.journal_cleared = set()
+        self.journal = ImageJournal(journal_path(file_path, self.capture_root()))
+        self.journal_loader.load(self.journal, lambda state: self.journal_loaded.emit(file_path, state))
+
+    def on_journal_loaded(self, file_path, state):
+        """ 기록 재생 결과를 화면에 반영 (UI 스레드), 재생하는 동안 새로 한 작업은 그대로 둠 """
+        if file_path != self.journal_image or not state.records:
+            return
+        if "marks" not in self.journal_cleared:
+            for x, y in state.mark_list():
+                self.annotations.add_mark(x, y)
+        if state.region is not None and "region" not in self.journal_cleared and not len(self.annotations.regions):
+            self.annotations.add_region(*state.region)
+            self.last_drawn_region = state.region
+        if "info" not in self.journal_cleared:
+            self.info_log.prepend([InfoEntry(InfoKind[kind], values, prefix) for kind, values, prefix in state.info])
+        self.image_label.update()
 
 #---------------------------------------------------------------
 # 사용자 region 그리기
@@ -800,18 +1818,11 @@ class SophiaCapture(QMainWindow):
         # 기존 사각형 제거
         self.remove_custom_region()
 
-        # 좌상단/우하단 원본 이미지 좌표 → 표시용 좌표 변환
-        ui_x1, ui_y1 = PosUtil.image_to_disp_pos(x, y, self.scale_factor)
-        ui_x2, ui_y2 = PosUtil.image_to_disp_pos(x + w, y + h, self.scale_factor)
-
-        disp_w = ui_x2 - ui_x1
-        disp_h = ui_y2 - ui_y1
-
-        self.drawn_rect_label = QLabel(self.image_label)
-        self.drawn_rect_label.setGeometry(ui_x1, ui_y1, disp_w, disp_h)
-        self.drawn_rect_label.setStyleSheet("border: 2px solid red;")
-        self.drawn_rect_label.setAttribute(Qt.WA_TransparentForMouseEvents)
-        self.drawn_rect_label.show()
+        # 원본 이미지 좌표로 저장, 확대/축소 시에도 paintEvent에서 현재 배율로 그림
+        self.annotations.add_region(x, y, w, h)
+        self.last_drawn_region = (x, y, w, h)
+        self.record("region", x=x, y=y, w=w, h=h)
+        self.image_label.update()
         print(f"사각형 표시됨: ({x}, {y}, {w}, {h})")
 
             
@@ -821,25 +1832,18 @@ class SophiaCapture(QMainWindow):
             return
 
         x, y, w, h = self.last_drawn_region
-        self.remove_drawn_region()
-
-        disp_x, disp_y = PosUtil.image_to_disp_pos(x, y, self.scale_factor)
-        disp_w = int(w * self.scale_factor)
-        disp_h = int(h * self.scale_factor)
-
-        self.drawn_rect_label = QLabel(self.image_label)
-        self.drawn_rect_label.setGeometry(disp_x, disp_y, disp_w, disp_h)
-        self.drawn_rect_label.setStyleSheet("border: 2px solid red;")
-        self.drawn_rect_label.setAttribute(Qt.WA_TransparentForMouseEvents)
-        self.drawn_rect_label.show()
+        self.annotations.clear_regions()
+        self.annotations.add_region(x, y, w, h)
+        self.image_label.update()
 
     def remove_custom_region(self):
         """ 그려진 사각형 제거 """
-        if self.drawn_rect_label:
-            self.drawn_rect_label.deleteLater()
-            self.drawn_rect_label = None
+        if len(self.annotations.regions):
+            self.annotations.clear_regions()
+            self.image_label.update()
             self.region_input.clear()  # 입력창 초기화
             self.last_drawn_region = None  # 마지막 그려진 영역 초기화
+            self.record("region_clear")
             print("사각형 제거됨")
 
 if __name__ == "__main__":
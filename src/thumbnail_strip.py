@@ -0,0 +1,215 @@
+import os
+import threading
+from collections import deque
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QObject, QSize, Signal
+from PySide6.QtGui import QImage, QPixmap, QColor
+from PySide6.QtWidgets import QListView, QAbstractItemView
+from core import lazy_import
+from cache import LRUCache
+from preview import has_reduced_decode, read_image_size
+from timing import span
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+STRIP_THUMB_SIDE = 160  # 썸네일 긴 변 (화면 픽셀)
+STRIP_PIXMAP_BYTES = 64 * 1024 * 1024  # 메모리에 둘 썸네일 QPixmap 예산
+STRIP_LOADER_THREADS = 2
+MAX_QUEUED_THUMBNAILS = 256  # 빠르게 스크롤해서 지나간 요청은 이 이상 쌓이면 오래된 것부터 버림
+
+
+def make_thumbnail(file_path, side=STRIP_THUMB_SIDE):
+    """file_path를 디코딩해서 긴 변이 side 이하인 BGR 배열로 (실패 시 None)
+
+    JPEG는 축소 디코딩(1/2 ~ 1/8)으로 원본 크기 디코딩을 피한다.
+    """
+    data = np.fromfile(file_path, dtype=np.uint8)
+    flags = cv2.IMREAD_COLOR
+    if has_reduced_decode(file_path):
+        size = read_image_size(file_path)
+        if size is not None:
+            for factor, mode in ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2)):
+                if max(size) // factor >= side:
+                    flags = mode
+                    break
+    image = cv2.imdecode(data, flags)
+    if image is None:
+        return None
+    h, w = image.shape[:2]
+    ratio = side / max(w, h)
+    if ratio < 1:
+        image = cv2.resize(image, (max(1, int(w * ratio)), max(1, int(h * ratio))), interpolation=cv2.INTER_AREA)
+    return image
+
+
+class ThumbnailLoader(QObject):
+    """썸네일을 워커 스레드에서 디스크 캐시 또는 디코딩으로 만든다.
+
+    요청은 스택처럼 최근 것부터 처리한다 (지금 화면에 보이는 칸이 먼저).
+    완료되면 loaded(경로, QImage) Signal (UI 스레드에서 QPixmap으로 변환).
+    """
+    loaded = Signal(str, QImage)
+
+    def __init__(self, thumbnails, workers=STRIP_LOADER_THREADS, parent=None):
+        super().__init__(parent)
+        self.thumbnails = thumbnails
+        self._queue = deque()
+        self._queued = set()
+        self._cond = threading.Condition()
+        self._stopped = False
+        for i in range(workers):
+            threading.Thread(target=self._run, name=f"thumbnail-{i}", daemon=True).start()
+
+    def request(self, file_path):
+        with self._cond:
+            if file_path in self._queued:
+                self._queue.remove(file_path)  # 다시 보이게 된 칸은 맨 앞으로
+            else:
+                self._queued.add(file_path)
+            self._queue.append(file_path)
+            if len(self._queue) > MAX_QUEUED_THUMBNAILS:
+                self._queued.discard(self._queue.popleft())
+            self._cond.notify()
+
+    def clear(self):
+        with self._cond:
+            self._queue.clear()
+            self._queued.clear()
+
+    def shutdown(self):
+        with self._cond:
+            self._stopped = True
+            self._queue.clear()
+            self._queued.clear()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                file_path = self._queue.pop()
+                self._queued.discard(file_path)
+            try:
+                image = self._load(file_path)
+            except Exception as e:
+                print(f"warning: 썸네일 실패 {file_path}: {e}")
+                image = None
+            if image is None:
+                continue
+            h, w = image.shape[:2]
+            qimage = QImage(image.data, w, h, image.strides[0], QImage.Format_BGR888).copy()
+            self.loaded.emit(file_path, qimage)
+
+    def _load(self, file_path):
+        image = self.thumbnails.get(file_path)
+        if image is not None:
+            return image
+        with span("thumbnail", path=file_path):
+            image = make_thumbnail(file_path, self.thumbnails.max_side)
+        if image is not None:
+            self.thumbnails.put(file_path, image)
+        return image
+
+
+class ThumbnailStripModel(QAbstractListModel):
+    """폴더의 이미지 목록 (썸네일은 뷰가 그리려고 요청한 칸만 불러옴)"""
+
+    def __init__(self, loader, parent=None):
+        super().__init__(parent)
+        self.folder = None
+        self._files = []
+        self._rows = {}  # 경로 -> 행
+        self._pixmaps = LRUCache(STRIP_PIXMAP_BYTES)
+        self._placeholder = None
+        self.loader = loader
+        loader.loaded.connect(self._on_loaded)
+
+    def set_files(self, folder, files):
+        self.beginResetModel()
+        self.folder = folder
+        self._files = files
+        self._rows = {path: row for row, path in enumerate(files)}
+        self.endResetModel()
+        self.loader.clear()  # 이전 목록에서 보이던 칸의 요청은 필요 없음
+
+    def row(self, file_path):
+        return self._rows.get(file_path)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._files)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        file_path = self._files[index.row()]
+        if role == Qt.DecorationRole:
+            pixmap = self._pixmaps.get(file_path)
+            if pixmap is None:
+                self.loader.request(file_path)
+                return self.placeholder()
+            return pixmap
+        if role == Qt.DisplayRole:
+            return os.path.basename(file_path)
+        if role in (Qt.ToolTipRole, Qt.UserRole):
+            return file_path
+        return None
+
+    def placeholder(self):
+        if self._placeholder is None:
+            self._placeholder = QPixmap(STRIP_THUMB_SIDE, STRIP_THUMB_SIDE * 9 // 16)
+            self._placeholder.fill(QColor("#404040"))
+        return self._placeholder
+
+    def _on_loaded(self, file_path, qimage):
+        pixmap = QPixmap.fromImage(qimage)
+        self._pixmaps.put(file_path, pixmap, qimage.sizeInBytes())
+        row = self._rows.get(file_path)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+
+class ThumbnailStrip(QListView):
+    """가로 한 줄 썸네일 목록, 클릭하면 file_activated(경로)
+
+    uniformItemSizes라 항목이 1만 개여도 배치는 한 번 계산이고, 보이는 칸만 data()를 요청한다.
+    """
+    file_activated = Signal(str)
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setViewMode(QListView.IconMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(False)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setIconSize(QSize(STRIP_THUMB_SIDE, STRIP_THUMB_SIDE * 3 // 4))
+        self.setGridSize(QSize(STRIP_THUMB_SIDE + 12, STRIP_THUMB_SIDE * 3 // 4 + 28))
+        self.setTextElideMode(Qt.ElideMiddle)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setFixedHeight(STRIP_THUMB_SIDE * 3 // 4 + 28 + self.horizontalScrollBar().sizeHint().height() + 8)
+        self.clicked.connect(lambda index: self.file_activated.emit(index.data(Qt.UserRole)))
+
+    def wheelEvent(self, event):
+        # 세로 휠로 가로 스크롤
+        if event.angleDelta().y() and not event.angleDelta().x():
+            bar = self.horizontalScrollBar()
+            bar.setValue(bar.value() - event.angleDelta().y())
+            return
+        super().wheelEvent(event)
+
+    def set_current(self, file_path):
+        row = self.model().row(file_path)
+        if row is None:
+            self.clearSelection()
+            return
+        index = self.model().index(row)
+        self.setCurrentIndex(index)
+        self.scrollTo(index, QAbstractItemView.PositionAtCenter)
@@ -0,0 +1,76 @@
+import math
+from core import lazy_import
+from timing import span
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+TILE_SIZE = 512  # 타일 한 변 크기 (표시용 물리 픽셀)
+LANCZOS_PAD = 4  # INTER_LANCZOS4 커널(8x8) 반경만큼 원본에서 여유를 두고 자름
+
+
+class TileRenderer:
+    """원본 이미지를 scale 배율로 표시할 때, 필요한 타일만 리샘플링한다.
+
+    표시 좌표계는 cv2.resize(original, (int(w*scale), int(h*scale)))의 결과와 같다.
+    source(피라미드 레벨 등 원본을 축소한 이미지)를 주면 원본 대신 source에서 리샘플링한다.
+    size=(w, h)를 주면 image 없이 그 크기를 원본 크기로 본다 (원본 디코딩 전 미리보기).
+    """
+
+    def __init__(self, image, scale, tile_size=TILE_SIZE, source=None, size=None):
+        self.image = image if source is None else source
+        self.scale = scale
+        self.tile_size = tile_size
+
+        w, h = size if size is not None else (image.shape[1], image.shape[0])
+        self.width = max(1, int(w * scale))
+        self.height = max(1, int(h * scale))
+        # cv2.resize와 같은 방식으로 실제 배율은 결과 크기/리샘플링 대상 크기로 계산
+        src_h, src_w = self.image.shape[:2]
+        self.scale_x = self.width / src_w
+        self.scale_y = self.height / src_h
+        self.cols = math.ceil(self.width / tile_size)
+        self.rows = math.ceil(self.height / tile_size)
+
+    def tile_rect(self, col, row):
+        """타일의 표시 좌표 (x, y, w, h)"""
+        x = col * self.tile_size
+        y = row * self.tile_size
+        w = min(self.tile_size, self.width - x)
+        h = min(self.tile_size, self.height - y)
+        return x, y, w, h
+
+    def tiles_in_rect(self, x, y, w, h):
+        """표시 좌표 사각형과 겹치는 타일 (col, row) 목록"""
+        if w <= 0 or h <= 0:
+            return []
+        c0 = max(0, x // self.tile_size)
+        r0 = max(0, y // self.tile_size)
+        c1 = min(self.cols - 1, (x + w - 1) // self.tile_size)
+        r1 = min(self.rows - 1, (y + h - 1) // self.tile_size)
+        return [(c, r) for r in range(r0, r1 + 1) for c in range(c0, c1 + 1)]
+
+    def render_tile(self, col, row):
+        """타일 하나를 BGR numpy 배열로 만든다."""
+        x, y, w, h = self.tile_rect(col, row)
+        if self.width == self.image.shape[1] and self.height == self.image.shape[0]:
+            # 1:1 이면 원본 그대로 (view)
+            return self.image[y:y + h, x:x + w]
+
+        img_h, img_w = self.image.shape[:2]
+        sx, sy = self.scale_x, self.scale_y
+
+        # 타일이 참조하는 원본 영역 (Lanczos 커널 여유 포함)
+        src_x0 = max(0, int(math.floor(x / sx)) - LANCZOS_PAD)
+        src_y0 = max(0, int(math.floor(y / sy)) - LANCZOS_PAD)
+        src_x1 = min(img_w, int(math.ceil((x + w) / sx)) + LANCZOS_PAD)
+        src_y1 = min(img_h, int(math.ceil((y + h) / sy)) + LANCZOS_PAD)
+        src = self.image[src_y0:src_y1, src_x0:src_x1]
+
+        # cv2.resize의 픽셀 중심 매핑: src = (dst + 0.5) / s - 0.5
+        matrix = np.array([
+            [sx, 0.0, sx * src_x0 + 0.5 * sx - 0.5 - x],
+            [0.0, sy, sy * src_y0 + 0.5 * sy - 0.5 - y],
+        ])
+        with span("resize", w * h * 3):
+            return cv2.warpAffine(src, matrix, (w, h), flags=cv2.INTER_LANCZOS4,
+                                  borderMode=cv2.BORDER_REPLICATE)
@@ -0,0 +1,133 @@
+"""구간(span) 시간 측정 - decode/resize/QPixmap/encode/write 등 어디서 느린지 숫자로 확인
+
+기본은 꺼져 있고, 꺼져 있을 때 span()은 미리 만들어 둔 빈 객체를 돌려주므로 비용이 거의 없다.
+
+    with span("decode", path=file_path) as s:
+        image = cv2.imdecode(...)
+        s.nbytes = image.nbytes
+
+켜는 방법: 환경변수 SOPHIA_TIMING=1 또는 enable()
+결과: summary() (구간별 통계), export_chrome_trace(path) (chrome://tracing, Perfetto에서 열기)
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+MAX_EVENTS = 200_000  # 보관할 최대 span 수 (넘으면 오래된 것부터 버림)
+
+_enabled = os.environ.get("SOPHIA_TIMING", "") not in ("", "0")
+_events = deque(maxlen=MAX_EVENTS)  # (name, start_ns, end_ns, thread_id, nbytes, args)
+_thread_names = {}
+
+
+class _NullSpan:
+    """측정이 꺼져 있을 때 쓰는 빈 span (속성 대입도 그냥 무시됨)"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "nbytes", "args", "_start")
+
+    def __init__(self, name, nbytes, args):
+        self.name = name
+        self.nbytes = nbytes
+        self.args = args
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        thread = threading.current_thread()
+        _thread_names.setdefault(thread.ident, thread.name)
+        _events.append((self.name, self._start, end, thread.ident, self.nbytes, self.args))
+        return False
+
+
+def span(name, nbytes=0, **args):
+    """with 문으로 감싼 구간의 시간을 기록 (nbytes: 처리한 바이트 수, args: trace에 남길 값)"""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, nbytes, args)
+
+
+def record(name, start, end, nbytes=0, **args):
+    """이미 잰 구간 기록 (start/end: time.perf_counter() 초)"""
+    if not _enabled:
+        return
+    thread = threading.current_thread()
+    _thread_names.setdefault(thread.ident, thread.name)
+    _events.append((name, int(start * 1e9), int(end * 1e9), thread.ident, nbytes, args))
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(enabled=True):
+    global _enabled
+    _enabled = enabled
+
+
+def clear():
+    _events.clear()
+
+
+def summary():
+    """구간 이름별 통계 [(name, count, total_ms, mean_ms, p95_ms, max_ms, total_bytes), ...] (총 시간 순)"""
+    groups = {}
+    for name, start, end, _, nbytes, _ in list(_events):
+        durations, total_bytes = groups.get(name, ([], 0))
+        durations.append((end - start) / 1e6)
+        groups[name] = (durations, total_bytes + nbytes)
+
+    rows = []
+    for name, (durations, total_bytes) in groups.items():
+        durations.sort()
+        total = sum(durations)
+        p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+        rows.append((name, len(durations), total, total / len(durations), p95, durations[-1], total_bytes))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows
+
+
+def format_summary():
+    """summary()를 표 형태 문자열 목록으로"""
+    lines = [f"{'span':20} {'count':>7} {'total ms':>10} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9} {'MB/s':>8}"]
+    for name, count, total, mean, p95, max_ms, nbytes in summary():
+        rate = f"{nbytes / 1024 / 1024 / (total / 1000):8.1f}" if nbytes and total else f"{'-':>8}"
+        lines.append(f"{name:20} {count:7d} {total:10.1f} {mean:9.2f} {p95:9.2f} {max_ms:9.2f} {rate}")
+    return lines
+
+
+def export_chrome_trace(path):
+    """기록된 span을 Chrome trace 형식(JSON)으로 저장, 저장한 span 수 반환"""
+    pid = os.getpid()
+    events = []
+    for name, start, end, tid, nbytes, args in list(_events):
+        event_args = dict(args)
+        if nbytes:
+            event_args["bytes"] = nbytes
+        events.append({"name": name, "ph": "X", "ts": start / 1000, "dur": (end - start) / 1000,
+                       "pid": pid, "tid": tid, "args": event_args})
+    span_count = len(events)
+    for tid, thread_name in list(_thread_names.items()):
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False, default=str)
+    return span_count
@@ -0,0 +1,72 @@
+import os
+import struct
+import time
+
+STABLE_CHECK_MS = 300  # 새 파일의 크기/수정시각을 다시 확인하는 간격
+MAX_WAIT_SECONDS = 60  # 이 시간이 지나도 다 써지지 않는 파일은 포기
+
+
+def is_complete_image(path, size):
+    """이미지 파일이 끝까지 다 써졌는지 (모르는 형식은 열 수 있으면 완료)"""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(6)
+            if head[:4] == b"\x89PNG":
+                f.seek(max(0, size - 8))
+                return f.read(4) == b"IEND"
+            if head[:2] == b"\xff\xd8":
+                f.seek(max(0, size - 2))
+                return f.read(2) == b"\xff\xd9"
+            if head[:2] == b"BM" and len(head) == 6:
+                return size >= struct.unpack("<I", head[2:6])[0]
+            return True
+    except OSError:
+        return False
+
+
+class StableFileTracker:
+    """감시 폴더에 새로 생긴 파일이 다 써질 때까지 기다린다.
+
+    - 크기와 수정시각이 한 번의 확인 간격 동안 그대로이고 파일 끝까지 다 써졌으면 완료로 본다
+      (PNG는 IEND, JPEG는 EOI 마커, BMP는 헤더의 파일 크기로 확인, Windows에서 쓰는 중이면 열기부터 실패)
+    - 한 번에 수백 개가 생겨도 poll()은 파일마다 stat 한 번이라 UI 스레드에서 불러도 된다
+    """
+
+    def __init__(self, max_wait=MAX_WAIT_SECONDS):
+        self.max_wait = max_wait
+        self._pending = {}  # path -> (size, mtime_ns, 처음 본 시각)
+
+    def add(self, paths):
+        now = time.monotonic()
+        for path in paths:
+            self._pending.setdefault(path, (-1, -1, now))
+
+    def discard(self, path):
+        self._pending.pop(path, None)
+
+    def clear(self):
+        self._pending.clear()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def poll(self):
+        """다 써진 파일을 수정시각 순으로 반환 (반환한 파일은 목록에서 뺀다), 사라지거나 너무 오래 바뀌는 파일은 버린다"""
+        now = time.monotonic()
+        ready = []
+        for path, (size, mtime, first_seen) in list(self._pending.items()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._pending[path]  # 임시 파일이 이름을 바꾸거나 지워짐
+                continue
+            if stat.st_size > 0 and (stat.st_size, stat.st_mtime_ns) == (size, mtime) and is_complete_image(path, stat.st_size):
+                del self._pending[path]
+                ready.append((stat.st_mtime_ns, path))
+            elif now - first_seen > self.max_wait:
+                print(f"warning: {path} 파일이 다 써지지 않아서 건너뜀")
+                del self._pending[path]
+            else:
+                self._pending[path] = (stat.st_size, stat.st_mtime_ns, first_seen)
+        ready.sort()
+        return [path for _, path in ready]
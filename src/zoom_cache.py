@@ -0,0 +1,73 @@
+import math
+from core import lazy_import
+from cache import LRUCache
+from timing import span
+cv2 = lazy_import("cv2")
+
+DEFAULT_ZOOM_CACHE_BYTES = 256 * 1024 * 1024  # 이미지 1장당 확대/축소 캐시 예산
+LOW_MEMORY_ZOOM_CACHE_BYTES = 32 * 1024 * 1024  # 메모리 절약 모드 예산
+ZOOM_STEP = 1.2  # zoom_in/zoom_out 1회 배율
+
+
+def quantize_scale(scale):
+    """배율을 캐시 키로 쓸 수 있게 양자화
+
+    x1.2, /1.2 를 반복하면 부동소수 오차가 쌓이므로, ZOOM_STEP의 거듭제곱에 가까우면
+    그 값으로 맞추고 아니면 소수 4자리로 반올림한다.
+    """
+    step = round(math.log(scale) / math.log(ZOOM_STEP))
+    snapped = ZOOM_STEP ** step
+    if abs(scale - snapped) <= snapped * 1e-3:
+        return snapped
+    return round(scale, 4)
+
+
+class ZoomCache:
+    """이미지 1장에 대한 확대/축소 캐시
+
+    - 피라미드: 원본을 절반씩 축소한 레벨 (축소 배율에서 원본 대신 사용)
+    - 타일: (양자화 배율, col, row) 별로 만들어 둔 QPixmap
+    둘 다 하나의 LRU 예산을 공유한다.
+    levels(k -> 레벨 배열)를 주면 피라미드는 그쪽에서 받는다 (대용량 모드: 디스크 memmap 레벨).
+    """
+
+    def __init__(self, image, max_bytes=DEFAULT_ZOOM_CACHE_BYTES, levels=None):
+        self.image = image
+        self.cache = LRUCache(max_bytes)
+        self.levels = levels
+
+    def level_for(self, scale):
+        """scale로 표시할 때 리샘플링에 쓸 피라미드 레벨 (0.5**k >= scale 인 가장 작은 레벨)"""
+        k = 0
+        h, w = self.image.shape[:2]
+        while scale <= 0.5 ** (k + 1) and min(w, h) >> (k + 1) >= 1:
+            k += 1
+        return self.level(k)
+
+    def level(self, k):
+        """k번째 피라미드 레벨 (원본의 1/2**k), 없으면 이전 레벨을 절반으로 축소해서 만든다"""
+        if k == 0:
+            return self.image
+        if self.levels is not None:
+            return self.levels(k)
+        level = self.cache.get(("level", k))
+        if level is None:
+            prev = self.level(k - 1)
+            h, w = prev.shape[:2]
+            with span("pyramid", prev.nbytes, level=k):
+                level = cv2.resize(prev, (max(1, w // 2), max(1, h // 2)), interpolation=cv2.INTER_AREA)
+            self.cache.put(("level", k), level, level.nbytes)
+        return level
+
+    def get_tile(self, scale, col, row):
+        return self.cache.get(("tile", quantize_scale(scale), col, row))
+
+    def put_tile(self, scale, col, row, pixmap):
+        nbytes = pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        self.cache.put(("tile", quantize_scale(scale), col, row), pixmap, nbytes)
+
+    def has_tile(self, scale, col, row):
+        return ("tile", quantize_scale(scale), col, row) in self.cache
+
+    def clear(self):
+        self.cache.clear()